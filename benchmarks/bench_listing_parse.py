@@ -0,0 +1,99 @@
+# --- LISTING EXTRACTION BENCHMARK ---
+# Cost of turning one /account/content page into rows, per page.
+# Default (no browser): only the Python side, i.e. decoding what crosses the
+# driver wire (page_source, or the rows as JSON) plus the BeautifulSoup parse;
+# the time EXTRACT_ROWS_JS itself takes in the page is not included, so these
+# figures are not a before/after comparison. --browser times both paths end to
+# end in headless Chrome (the before/after result) and checks they agree.
+#
+#   python benchmarks/bench_listing_parse.py                  (generated 50-video page)
+#   python benchmarks/bench_listing_parse.py --html saved_listing.html --browser
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from rumble_scan import EXTRACT_ROWS_JS, extract_rows, parse_listing
+from standin_server import make_videos, render_listing
+
+
+def measure(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return statistics.median(times), peak
+
+
+def wire(value):
+    # Selenium returns script results and page_source as a JSON response body
+    return json.loads(json.dumps({"value": value}))["value"]
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Listing row extraction: BeautifulSoup vs in-page script.")
+    ap.add_argument("--html", help="saved /account/content page (default: generated 50-video page)")
+    ap.add_argument("--repeat", type=int, default=50)
+    ap.add_argument("--browser", action="store_true", help="also time both paths in headless Chrome")
+    ap.add_argument("--chrome-binary", default=os.environ.get("CHROME_BINARY", ""))
+    ap.add_argument("--chromedriver", default=os.environ.get("CHROMEDRIVER", ""))
+    args = ap.parse_args()
+
+    if args.html:
+        with open(args.html, encoding="utf-8") as f:
+            html = f.read()
+        path = os.path.abspath(args.html)
+    else:
+        html = render_listing(make_videos(50), 1, 1)
+        path = os.path.join(tempfile.gettempdir(), "rumble_listing_50.html")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(html)
+
+    rows = parse_listing(html)
+    payload = json.dumps(rows)
+    print(f"Page: {len(html) / 1024:.0f} KB HTML, {len(rows)} rows, {len(payload) / 1024:.1f} KB as row JSON")
+
+    before = measure(lambda: parse_listing(wire(html)), args.repeat)
+    after = measure(lambda: wire(rows), args.repeat)
+    print(f"\n{'python side only':<28}{'median ms':>10}{'peak KB':>10}")
+    print(f"{'page_source + BeautifulSoup':<28}{before[0] * 1000:>10.2f}{before[1] / 1024:>10.0f}")
+    print(f"{'row JSON decode':<28}{after[0] * 1000:>10.2f}{after[1] / 1024:>10.0f}")
+    print("Wire transfer and parsing cost only; the in-page script's own time is not measured here.")
+
+    if not args.browser:
+        print("Run with --browser for the end-to-end before/after comparison.")
+        return
+    from bench_swarm import new_chrome
+    try:
+        driver = new_chrome(args)
+    except Exception as e:
+        print(f"\nBrowser timing skipped, Chrome could not be started: {str(e).splitlines()[0]}")
+        return
+    try:
+        driver.get("file://" + path)
+        bs_rows = parse_listing(driver.page_source)
+        js_rows = extract_rows(driver)
+        t_bs = measure(lambda: parse_listing(driver.page_source), args.repeat)[0]
+        t_js = measure(lambda: driver.execute_script(EXTRACT_ROWS_JS), args.repeat)[0]
+    finally:
+        driver.quit()
+    print(f"\n{'in Chrome, end to end':<28}{'median ms':>10}")
+    print(f"{'page_source + BeautifulSoup':<28}{t_bs * 1000:>10.2f}")
+    print(f"{'execute_script':<28}{t_js * 1000:>10.2f}")
+    print(f"speedup x{t_bs / max(t_js, 1e-9):.1f}, rows identical: {bs_rows == js_rows}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# --- RULE MATCHER MICROBENCHMARK ---
+# Compares the legacy per-row rule loop against the compiled RuleMatcher as the
+# rule count grows. Run from the repo root:
+#   python benchmarks/bench_rule_matcher.py > bench_output.txt
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rumble_rules import RuleMatcher
+
+WORDS = ["gaming", "review", "ps5", "xbox", "live", "stream", "news", "update", "politics", "tutorial",
+         "podcast", "episode", "highlights", "reaction", "music", "cover", "trailer", "vlog", "daily", "unboxing",
+         "speedrun", "finale", "interview", "debate", "recap", "season", "challenge", "build", "guide", "tips"]
+CATEGORIES = ["Gaming", "News", "Music", "Entertainment", "Podcasts", "Sports", "Education"]
+
+
+def make_rules(n, rng):
+    rules = []
+    for i in range(n):
+        kw = f"{rng.choice(WORDS)}{i}" if i % 5 else rng.choice(WORDS) + " " + rng.choice(WORDS)
+        cat = rng.choice(CATEGORIES) if i % 3 == 0 else ""
+        rules.append({"title": kw, "cat": cat, "target": f"Channel {i}", "tags": ""})
+    return rules
+
+
+def make_titles(n, rng):
+    return [" ".join(rng.choice(WORDS).title() for _ in range(8)) for _ in range(n)]
+
+
+def legacy_match(rules, title, cat):
+    # Edit-phase loop as it existed before the compiled matcher
+    for r in rules:
+        t_kw = r.get('title', '').strip().lower()
+        c_kw = r.get('cat', '').strip().lower()
+        if t_kw and not c_kw:
+            if t_kw in title.lower(): return r
+        elif t_kw and c_kw:
+            if t_kw in title.lower() and c_kw in cat.lower(): return r
+        elif not t_kw and c_kw:
+            if c_kw in cat.lower(): return r
+    return None
+
+
+def per_title_us(fn, titles, cats):
+    start = time.perf_counter()
+    for t, c in zip(titles, cats):
+        fn(t, c)
+    return (time.perf_counter() - start) / len(titles) * 1e6
+
+
+def main():
+    rng = random.Random(1234)
+    titles = make_titles(5000, rng)
+    cats = [rng.choice(CATEGORIES) for _ in titles]
+
+    print(f"{'rules':>6} {'compile ms':>11} {'legacy us/title':>16} {'matcher us/title':>17} {'speedup':>8}")
+    for n in (10, 50, 100, 250, 500, 1000, 2000):
+        rules = make_rules(n, rng)
+
+        t0 = time.perf_counter()
+        matcher = RuleMatcher(rules)
+        compile_ms = (time.perf_counter() - t0) * 1000
+
+        for t, c in zip(titles[:500], cats[:500]):
+            assert matcher.match(t, c) is legacy_match(rules, t, c)
+
+        legacy = per_title_us(lambda t, c: legacy_match(rules, t, c), titles, cats)
+        compiled = per_title_us(matcher.match, titles, cats)
+        print(f"{n:>6} {compile_ms:>11.2f} {legacy:>16.2f} {compiled:>17.2f} {legacy / compiled:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
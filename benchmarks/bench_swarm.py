@@ -0,0 +1,291 @@
+# --- OFFLINE SWARM BENCHMARK ---
+# Runs the swarm's scanning and editing steps against the local stand-in
+# server and reports throughput, page latency and memory per worker count.
+#
+#   python benchmarks/bench_swarm.py --videos 600 --latency 0.15 --workers 1,2,4,8
+#   python benchmarks/bench_swarm.py --browser --workers 1,2,4 --chrome-binary /path/to/chrome
+#   python benchmarks/bench_swarm.py --browser --tabs --workers 4,8,20     (workers as tabs of one browser)
+#   python benchmarks/bench_swarm.py --browser --block Safe                (network blocking profile)
+#
+# The HTTP scan scenario needs only requests/bs4. The browser scenario drives
+# real headless Chrome through Selenium (scan, open modal, read form, save).
+import argparse
+import os
+import queue
+import socket
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from rumble_metrics import percentile
+from standin_server import StandInSite, start_server
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+RULES = [
+    {"title": "gaming", "cat": "", "target": "Gaming Channel", "tags": "gaming, gameplay"},
+    {"title": "news", "cat": "News", "target": "News Desk", "tags": ""},
+    {"title": "podcast", "cat": "", "target": "Podcast Hub", "tags": "podcast"},
+]
+
+
+def self_rss_mb():
+    if psutil:
+        return psutil.Process().memory_info().rss / 1e6
+    try:
+        import resource  # Unix only
+    except ImportError:
+        return float("nan")
+    # Peak rather than current RSS: the closest the standard library gets
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1e3
+
+
+def browser_rss_mb(drivers):
+    # Sum of RSS for every chromedriver/Chrome process started by these drivers
+    if not psutil: return float("nan")
+    total = 0
+    for d in drivers:
+        try:
+            root = psutil.Process(d.service.process.pid)
+            for p in [root] + root.children(recursive=True):
+                total += p.memory_info().rss
+        except Exception:
+            pass
+    return total / 1e6
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_site(args):
+    # Fresh site state per scenario, always on the port rumble_scan was pointed at
+    site = StandInSite(args.videos, args.per_page, args.latency, args.jitter, args.failure_rate,
+                       args.save_failure_rate)
+    server, base = start_server(site, port=args.port)
+    return site, server, base
+
+
+def stop_site(server):
+    server.shutdown()
+    server.server_close()
+
+
+# --- HTTP SCAN SCENARIO ---
+def bench_http_scan(args, workers):
+    from rumble_rules import RuleMatcher
+    from rumble_scan import HttpScanner
+
+    site, server, _ = start_site(args)
+    matcher = RuleMatcher(RULES)
+    scanner = HttpScanner("", concurrency=workers)
+    latencies = []
+    lock = threading.Lock()
+    fetch = scanner.fetch_listing
+
+    def timed_fetch(page):
+        t0 = time.perf_counter()
+        try:
+            return fetch(page)
+        finally:
+            with lock:
+                latencies.append(time.perf_counter() - t0)
+
+    scanner.fetch_listing = timed_fetch
+    counts = {"videos": 0, "matches": 0}
+
+    def on_page(page, rows):
+        counts["videos"] += len(rows)
+        counts["matches"] += sum(1 for r in rows if matcher.match(r["title"]))
+
+    t0 = time.perf_counter()
+    pages = scanner.scan(1, site.total_pages + 1, on_page)
+    elapsed = time.perf_counter() - t0
+    scanner.close()
+    stop_site(server)
+    return {"workers": workers, "pages": pages, "videos": counts["videos"], "matches": counts["matches"],
+            "elapsed": elapsed, "videos_min": counts["videos"] / elapsed * 60,
+            "p50": percentile(sorted(latencies), 50), "p90": percentile(sorted(latencies), 90), "mem_mb": self_rss_mb()}
+
+
+# --- BROWSER SCENARIO ---
+def new_chrome(args):
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+    opts = webdriver.ChromeOptions()
+    opts.add_argument("--headless=new")
+    opts.add_argument("--no-sandbox")
+    opts.add_argument("--disable-dev-shm-usage")
+    if args.tabs:
+        from rumble_browser import TAB_FLAGS
+        for flag in TAB_FLAGS:
+            opts.add_argument(flag)
+    opts.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    opts.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
+    if args.chrome_binary: opts.binary_location = args.chrome_binary
+    service = Service(args.chromedriver) if args.chromedriver else None
+    return webdriver.Chrome(options=opts, service=service)
+
+
+def browser_worker(driver, pages, base, matcher, stats, lock, dry_run):
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+    from rumble_edit import CLOSE_MODAL_JS, DirectEditor, FORM_SNAPSHOT_JS
+    from rumble_rules import plan_changes
+    from rumble_scan import FIND_TRIGGER_JS, parse_listing
+
+    editor = DirectEditor()
+    while True:
+        try:
+            page = pages.get_nowait()
+        except queue.Empty:
+            break
+        t0 = time.perf_counter()
+        try:
+            driver.get(f"{base}/account/content?&pg={page}")
+            WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.CSS_SELECTOR, ".my-videos-nav")))
+        except Exception:
+            with lock: stats["errors"] += 1
+            continue
+        load = time.perf_counter() - t0
+        rows = parse_listing(driver.page_source)
+        matched = [r for r in rows if matcher.match(r["title"])]
+        with lock:
+            stats["latency"].append(load)
+            stats["videos"] += len(rows)
+
+        for row in matched:
+            try:
+                trigger = driver.execute_script(FIND_TRIGGER_JS, row["video_id"], row["position"], row["title"])
+                driver.execute_script("arguments[0].click();", trigger)
+                edit_btn = WebDriverWait(driver, 5).until(
+                    EC.element_to_be_clickable((By.CSS_SELECTOR, ".dd-menu[style*='block'] #edit")))
+                driver.execute_script("arguments[0].click();", edit_btn)
+                WebDriverWait(driver, 5).until(EC.visibility_of_element_located((By.ID, "video-form")))
+                WebDriverWait(driver, 5).until(
+                    lambda d: d.find_element(By.ID, "title").get_attribute("value") != "")
+                snap = driver.execute_script(FORM_SNAPSHOT_JS)
+                rule = matcher.match(snap["title"], snap["category"])
+                if rule:
+                    new_chan, new_tags = plan_changes(rule, snap["channel"], snap["tags"])
+                    if (new_chan or new_tags) and not dry_run:
+                        editor.sync_cookies(driver.get_cookies())
+                        editor.submit(snap, new_chan, new_tags)
+                        with lock: stats["saves"] += 1
+                driver.execute_script(CLOSE_MODAL_JS)
+                WebDriverWait(driver, 5).until(EC.invisibility_of_element_located((By.ID, "video-form")))
+                with lock: stats["edited"] += 1
+            except Exception:
+                with lock: stats["errors"] += 1
+    editor.close()
+
+
+def bench_browser(args, workers):
+    from rumble_rules import RuleMatcher
+
+    site, server, base = start_site(args)
+    matcher = RuleMatcher(RULES)
+    pages = queue.Queue()
+    for p in range(1, site.total_pages + 1):
+        pages.put(p)
+
+    t0 = time.perf_counter()
+    if args.tabs:
+        from rumble_browser import attach_tab
+        host = new_chrome(args)
+        drivers = [host] + [attach_tab(host, args.chromedriver or None, perf_log=True) for _ in range(workers - 1)]
+    else:
+        drivers = [new_chrome(args) for _ in range(workers)]
+    from rumble_browser import apply_blocklist
+    from rumble_netblock import NetworkStats, block_patterns
+    net = NetworkStats()
+    for d in drivers:
+        apply_blocklist(d, block_patterns(args.block))
+        d.get_log("performance")
+    launch = time.perf_counter() - t0
+    mem = browser_rss_mb(drivers)
+    stats = {"latency": [], "videos": 0, "edited": 0, "saves": 0, "errors": 0}
+    lock = threading.Lock()
+
+    t0 = time.perf_counter()
+    threads = [threading.Thread(target=browser_worker, args=(d, pages, base, matcher, stats, lock, args.dry_run))
+               for d in drivers]
+    for t in threads: t.start()
+    for t in threads: t.join()
+    elapsed = time.perf_counter() - t0
+    mem = max(mem, browser_rss_mb(drivers))
+    for d in drivers:
+        net.add_log(d.get_log("performance"))
+    net = net.summary()
+
+    for d in reversed(drivers):  # tabs before their shared browser
+        d.quit()
+    stop_site(server)
+    return {"workers": workers, "launch": launch, "elapsed": elapsed, "videos": stats["videos"],
+            "edited": stats["edited"], "saves": stats["saves"], "errors": stats["errors"],
+            "videos_min": stats["videos"] / elapsed * 60, "edits_min": stats["edited"] / elapsed * 60,
+            "p50": percentile(sorted(stats["latency"]), 50),
+            "p90": percentile(sorted(stats["latency"]), 90), "mem_mb": mem,
+            "net_mb": net["bytes"] / 1e6, "blocked": net["blocked"]}
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Offline swarm benchmark against the local stand-in server.")
+    ap.add_argument("--videos", type=int, default=600)
+    ap.add_argument("--per-page", type=int, default=20)
+    ap.add_argument("--latency", type=float, default=0.1)
+    ap.add_argument("--jitter", type=float, default=0.05)
+    ap.add_argument("--failure-rate", type=float, default=0.0)
+    ap.add_argument("--save-failure-rate", type=float, default=0.0)
+    ap.add_argument("--workers", default="1,2,4,8")
+    ap.add_argument("--browser", action="store_true", help="also run the headless Chrome scenario")
+    ap.add_argument("--chrome-binary", default=os.environ.get("CHROME_BINARY", ""))
+    ap.add_argument("--chromedriver", default=os.environ.get("CHROMEDRIVER", ""))
+    ap.add_argument("--dry-run", action="store_true", help="browser scenario reads forms but does not save")
+    ap.add_argument("--tabs", action="store_true", help="browser scenario runs workers as tabs of one browser")
+    ap.add_argument("--block", choices=["Safe", "Off"], default="Off", help="browser scenario network blocking")
+    args = ap.parse_args()
+    worker_counts = [int(w) for w in args.workers.split(",") if w.strip()]
+    # rumble_scan reads RUMBLE_BASE_URL at import time, so fix the port first
+    args.port = free_port()
+    os.environ["RUMBLE_BASE_URL"] = f"http://127.0.0.1:{args.port}"
+
+    print(f"Stand-in: {args.videos} videos, {args.per_page}/page, latency {args.latency}+{args.jitter}s, "
+          f"failure rate {args.failure_rate}")
+    print("\nHTTP scan")
+    print(f"{'workers':>8} {'pages':>6} {'videos':>7} {'secs':>7} {'videos/min':>11} {'p50 s':>7} {'p90 s':>7} "
+          f"{'rss MB':>7}")
+    for n in worker_counts:
+        r = bench_http_scan(args, n)
+        print(f"{r['workers']:>8} {r['pages']:>6} {r['videos']:>7} {r['elapsed']:>7.2f} {r['videos_min']:>11.0f} "
+              f"{r['p50']:>7.3f} {r['p90']:>7.3f} {r['mem_mb']:>7.1f}")
+
+    if not args.browser: return
+    try:
+        new_chrome(args).quit()
+    except Exception as e:
+        print(f"\nBrowser scenario skipped, Chrome could not be started: {str(e).splitlines()[0]}")
+        return
+    print(f"\nBrowser scan + edit ({'tabs of one browser' if args.tabs else 'one browser per worker'}, "
+          f"blocking {args.block})")
+    print(f"{'workers':>8} {'launch s':>9} {'secs':>7} {'videos':>7} {'edited':>7} {'saves':>6} {'errors':>7} "
+          f"{'videos/min':>11} {'edits/min':>10} {'p50 s':>7} {'p90 s':>7} {'chrome MB':>10} {'net MB':>7} "
+          f"{'blocked':>8}")
+    for n in worker_counts:
+        r = bench_browser(args, n)
+        print(f"{r['workers']:>8} {r['launch']:>9.1f} {r['elapsed']:>7.1f} {r['videos']:>7} {r['edited']:>7} "
+              f"{r['saves']:>6} {r['errors']:>7} {r['videos_min']:>11.0f} {r['edits_min']:>10.0f} "
+              f"{r['p50']:>7.3f} {r['p90']:>7.3f} {r['mem_mb']:>10.0f} {r['net_mb']:>7.1f} {r['blocked']:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+# --- LOCAL RUMBLE STAND-IN ---
+# Serves just enough of rumble.com for the swarm to run offline: a paginated
+# /account/content listing (.my-videos-nav, .open-menu, .dd-menu #edit), the
+# #video-form edit modal with details/settings tabs and a save endpoint.
+# Latency and failures can be injected to test behaviour under a slow site.
+#
+#   python benchmarks/standin_server.py --videos 1000 --latency 0.2
+#   set RUMBLE_BASE_URL=http://127.0.0.1:8765 before launching the app/CLI
+import argparse
+import html
+import json
+import random
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+CATEGORIES = ["Gaming", "News", "Music", "Entertainment", "Podcasts", "Sports", "Education"]
+CHANNELS = ["User Profile", "Gaming Channel", "News Desk", "Music Room", "Podcast Hub"]
+WORDS = ["gaming", "review", "ps5", "xbox", "live", "stream", "news", "update", "politics", "tutorial",
+         "podcast", "episode", "highlights", "reaction", "music", "cover", "trailer", "vlog", "daily", "unboxing"]
+
+PAGE_SCRIPT = """
+<script>
+document.addEventListener('click', function (ev) {
+    var t = ev.target;
+    if (t.classList.contains('open-menu')) {
+        document.querySelectorAll('.dd-menu').forEach(function (m) { m.style.display = 'none'; });
+        t.parentNode.querySelector('.dd-menu').style.display = 'block';
+    } else if (t.id === 'edit') {
+        ev.preventDefault();
+        var vid = t.getAttribute('data-video-id');
+        t.parentNode.style.display = 'none';
+        fetch('/account/video/form?id=' + vid).then(function (r) { return r.json(); }).then(openForm);
+    } else if (t.matches('.tabs li')) {
+        document.querySelectorAll('.tabs li').forEach(function (li) { li.classList.remove('active'); });
+        document.querySelectorAll('.tab-pane').forEach(function (p) { p.style.display = 'none'; });
+        t.classList.add('active');
+        document.getElementById('pane-' + t.getAttribute('data-tab')).style.display = 'block';
+    } else if (t.id === '0' && t.closest('.overlay-dialog')) {
+        var form = document.getElementById('video-form');
+        fetch(form.getAttribute('action'), {method: 'POST', body: new URLSearchParams(new FormData(form)),
+                                            headers: {'X-Requested-With': 'XMLHttpRequest'}})
+            .then(function (r) { return r.json(); })
+            .then(function (d) { if (d.success) closeForm(); else form.setAttribute('data-error', d.error); });
+    } else if (t.id === '1' && t.closest('.overlay-dialog')) {
+        closeForm();
+    }
+});
+document.addEventListener('keydown', function (ev) { if (ev.key === 'Escape') closeForm(); });
+function openForm(v) {
+    var form = document.getElementById('video-form'), f = form.elements;
+    f['video_id'].value = v.id;
+    f['title'].value = v.title;
+    f['tags'].value = v.tags;
+    f['siteChannelId'].value = v.category_id;
+    f['channelId'].value = v.channel_id;
+    document.querySelector('.tabs li[data-tab="details"]').click();
+    document.querySelector('.overlay-dialog').style.display = 'block';
+    form.style.display = 'block';
+}
+function closeForm() {
+    document.querySelector('.overlay-dialog').style.display = 'none';
+    document.getElementById('video-form').style.display = 'none';
+}
+</script>
+"""
+
+
+def make_videos(count, seed=7):
+    rng = random.Random(seed)
+    videos = []
+    for i in range(count):
+        title = " ".join(rng.choice(WORDS).title() for _ in range(6))
+        videos.append({"id": f"v{count - i:x}z", "title": f"{title} #{count - i}",
+                       "category_id": rng.randrange(len(CATEGORIES)), "channel_id": 0, "tags": ""})
+    return videos  # newest first, like the real listing
+
+
+def render_listing(videos, page, total_pages):
+    rows = []
+    for v in videos:
+        slug = v["title"].lower().replace(" ", "-").replace("#", "")
+        rows.append(
+            f'<article class="video-item" data-video-id="{v["id"]}">'
+            f'<a href="/{v["id"]}-{html.escape(slug)}.html"><img src="/thumb/{v["id"]}.jpg" alt=""></a>'
+            f'<h3 class="video-title">{html.escape(v["title"])}</h3>'
+            f'<div class="video-meta">{CATEGORIES[v["category_id"]]}</div>'
+            f'<div class="my-videos-nav"><span class="open-menu">&#8942;</span>'
+            f'<div class="dd-menu" style="display:none"><a id="edit" href="#" data-video-id="{v["id"]}">Edit</a>'
+            f'</div></div></article>')
+    pager = "".join(f'<a href="/account/content?&pg={p}">{p}</a>'
+                    for p in range(max(1, page - 2), min(total_pages, page + 2) + 1))
+    if total_pages > page + 2:
+        pager += f' ... <a href="/account/content?&pg={total_pages}">{total_pages}</a>'
+    cat_opts = "".join(f'<option value="{i}">{c}</option>' for i, c in enumerate(CATEGORIES))
+    chan_opts = "".join(f'<option value="{i}">{c}</option>' for i, c in enumerate(CHANNELS))
+    modal = (
+        '<div class="overlay-dialog" style="display:none">'
+        '<form id="video-form" action="/account/video/save" method="post" style="display:none">'
+        '<input type="hidden" name="video_id"><input type="hidden" name="csrf" value="standin">'
+        '<ul class="tabs"><li data-tab="details" class="active">Details</li><li data-tab="settings">Settings</li></ul>'
+        '<div class="tab-pane" id="pane-details"><input id="title" name="title"><input id="tags" name="tags">'
+        f'<select id="siteChannelId" name="siteChannelId">{cat_opts}</select></div>'
+        '<div class="tab-pane" id="pane-settings" style="display:none">'
+        f'<select id="channelId" name="channelId">{chan_opts}</select></div>'
+        '</form><div class="buttons"><button id="0" type="button">Save</button>'
+        '<button id="1" type="button">Cancel</button></div></div>')
+    body = "".join(rows) if rows else '<p class="no-videos">No videos found.</p>'
+    return (f'<!doctype html><html><head><title>Content</title><link rel="stylesheet" href="/static/site.css">'
+            f'</head><body><main class="my-videos">{body}</main><div class="paginator">{pager}</div>'
+            f'{modal}{PAGE_SCRIPT}</body></html>')
+
+
+class StandInSite:
+    def __init__(self, videos=400, per_page=20, latency=0.0, jitter=0.0, failure_rate=0.0,
+                 save_failure_rate=0.0, seed=7):
+        self.videos = make_videos(videos, seed)
+        self.by_id = {v["id"]: v for v in self.videos}
+        self.per_page = per_page
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.save_failure_rate = save_failure_rate
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.stats = {"listing": 0, "form": 0, "save": 0, "failed": 0}
+
+    @property
+    def total_pages(self):
+        return max(1, -(-len(self.videos) // self.per_page))
+
+    def delay(self):
+        if self.latency or self.jitter:
+            time.sleep(self.latency + self.rng.random() * self.jitter)
+
+    def should_fail(self, rate):
+        with self.lock:
+            fail = rate and self.rng.random() < rate
+            if fail: self.stats["failed"] += 1
+        return fail
+
+    def count(self, key):
+        with self.lock:
+            self.stats[key] += 1
+
+    def page(self, page):
+        start = (page - 1) * self.per_page
+        return self.videos[start:start + self.per_page] if page >= 1 else []
+
+
+def make_handler(site):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def _send(self, status, body, ctype="text/html; charset=utf-8"):
+            data = body.encode("utf-8") if isinstance(body, str) else body
+            self.send_response(status)
+            self.send_header("Content-Type", ctype)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _json(self, status, obj):
+            self._send(status, json.dumps(obj), "application/json")
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            qs = parse_qs(url.query)
+            site.delay()
+            if url.path == "/account/content":
+                site.count("listing")
+                if site.should_fail(site.failure_rate):
+                    return self._send(503, "<h1>Service Unavailable</h1>")
+                page = int(qs.get("pg", ["1"])[0] or 1)
+                return self._send(200, render_listing(site.page(page), page, site.total_pages))
+            if url.path == "/account/video/form":
+                site.count("form")
+                v = site.by_id.get(qs.get("id", [""])[0])
+                return self._json(200, v) if v else self._json(404, {"error": "not found"})
+            if url.path.startswith(("/thumb/", "/static/")):
+                return self._send(200, b"\0" * 2048, "application/octet-stream")
+            return self._send(404, "<h1>Not Found</h1>")
+
+        def do_POST(self):
+            url = urlparse(self.path)
+            length = int(self.headers.get("Content-Length") or 0)
+            form = {k: v[-1] for k, v in parse_qs(self.rfile.read(length).decode("utf-8"),
+                                                   keep_blank_values=True).items()}
+            site.delay()
+            if url.path != "/account/video/save":
+                return self._send(404, "<h1>Not Found</h1>")
+            site.count("save")
+            if site.should_fail(site.save_failure_rate):
+                return self._json(200, {"success": False, "error": "Injected validation failure"})
+            v = site.by_id.get(form.get("video_id", ""))
+            if not v:
+                return self._json(200, {"success": False, "error": "Unknown video"})
+            with site.lock:
+                v["title"] = form.get("title", v["title"])
+                v["tags"] = form.get("tags", v["tags"])
+                v["category_id"] = int(form.get("siteChannelId", v["category_id"]))
+                v["channel_id"] = int(form.get("channelId", v["channel_id"]))
+            return self._json(200, {"success": True})
+
+    return Handler
+
+
+def start_server(site, host="127.0.0.1", port=0):
+    # Returns (server, base_url); the server runs on a daemon thread
+    server = ThreadingHTTPServer((host, port), make_handler(site))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_port}"
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Local stand-in for the Rumble account content pages.")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--videos", type=int, default=400)
+    ap.add_argument("--per-page", type=int, default=20)
+    ap.add_argument("--latency", type=float, default=0.0, help="fixed delay per request (s)")
+    ap.add_argument("--jitter", type=float, default=0.0, help="extra random delay per request (s)")
+    ap.add_argument("--failure-rate", type=float, default=0.0, help="fraction of listing requests answered 503")
+    ap.add_argument("--save-failure-rate", type=float, default=0.0, help="fraction of saves rejected")
+    args = ap.parse_args()
+
+    site = StandInSite(args.videos, args.per_page, args.latency, args.jitter, args.failure_rate,
+                       args.save_failure_rate)
+    server, base = start_server(site, port=args.port)
+    print(f"Stand-in serving {len(site.videos)} videos over {site.total_pages} pages at {base}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
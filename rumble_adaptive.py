@@ -0,0 +1,95 @@
+# --- ADAPTIVE CONCURRENCY ---
+# Additive-increase / multiplicative-decrease on the number of browser
+# workers. Editors report how long each video's edit form took to open and
+# whether the video reached an outcome; each control interval the window is
+# compared with the best latency seen so far, its error rate and (when psutil
+# is installed) host CPU and memory. One more worker is added while
+# everything looks healthy, and the count is cut back as soon as the site
+# slows down, errors pile up or the host runs hot.
+import math
+import threading
+
+from rumble_metrics import percentile
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+MIN_SAMPLES = 4  # videos needed in a window before deciding anything
+ERROR_SHRINK = 0.2  # error rate that makes the swarm back off
+ERROR_GROW = 0.05  # error rate still considered healthy
+SLOW_FACTOR = 2.5  # p50 this many times the best p50 means the site is struggling
+GROW_FACTOR = 1.5  # p50 must stay within this factor of the best to grow
+CPU_LIMIT = 85  # percent
+MEM_LIMIT = 85  # percent
+DECREASE = 0.7  # multiplicative decrease
+
+
+class ConcurrencyController:
+    def __init__(self, min_workers, max_workers, start):
+        self.min_workers = max(1, min_workers)
+        self.max_workers = max(self.min_workers, max_workers)
+        self.target = min(max(start, self.min_workers), self.max_workers)
+        self.peak = self.target
+        self.baseline = None
+        self._lock = threading.Lock()
+        self._latencies = []
+        self._errors = 0
+        if psutil: psutil.cpu_percent(None)  # first call only primes the counter
+
+    def record(self, seconds, ok=True):
+        with self._lock:
+            if ok:
+                self._latencies.append(seconds)
+            else:
+                self._errors += 1
+
+    @staticmethod
+    def host_load():
+        if not psutil: return None, None
+        return psutil.cpu_percent(None), psutil.virtual_memory().percent
+
+    def _shrink(self):
+        new = max(self.min_workers, math.floor(self.target * DECREASE))
+        if new == self.target and new > self.min_workers: new -= 1
+        return new
+
+    def decide(self, has_work=True):
+        # Returns (target, reason); the window is consumed once it has enough videos
+        with self._lock:
+            if len(self._latencies) + self._errors < MIN_SAMPLES:
+                return self.target, "waiting for samples"
+            lat = sorted(self._latencies)
+            errors = self._errors
+            self._latencies = []
+            self._errors = 0
+
+        err_rate = errors / (len(lat) + errors)
+        p50 = percentile(lat, 50) if lat else None
+        if p50 is not None:
+            self.baseline = p50 if self.baseline is None else min(self.baseline, p50)
+        cpu, mem = self.host_load()
+
+        stats = f"errors {err_rate:.0%}"
+        if p50 is not None: stats = f"p50 {p50:.2f}s (best {self.baseline:.2f}s), " + stats
+        if cpu is not None: stats += f", CPU {cpu:.0f}%, mem {mem:.0f}%"
+
+        if err_rate >= ERROR_SHRINK:
+            new, why = self._shrink(), "error rate high"
+        elif p50 is not None and p50 > SLOW_FACTOR * self.baseline:
+            new, why = self._shrink(), "edit forms slowing down"
+        elif cpu is not None and (cpu >= CPU_LIMIT or mem >= MEM_LIMIT):
+            new, why = self._shrink(), "host busy"
+        elif not has_work:
+            new, why = self.target, "queue drained"
+        elif self.target >= self.max_workers:
+            new, why = self.target, "at maximum"
+        elif err_rate <= ERROR_GROW and (p50 is None or p50 <= GROW_FACTOR * self.baseline):
+            new, why = self.target + 1, "healthy"
+        else:
+            new, why = self.target, "holding"
+
+        self.target = new
+        self.peak = max(self.peak, new)
+        return new, f"{why}; {stats}"
@@ -0,0 +1,606 @@
+# --- BROWSER WORKERS ---
+# Everything that drives a Chrome instance: launching (with auto-heal), the
+# listing scan and the edit modal. Imported lazily by the engine so the CLI and
+# page discovery never pay for selenium / undetected_chromedriver.
+import sys
+import os
+import pickle
+import queue
+import time
+
+# --- HOTFIX FOR PYTHON 3.12+ REMOVAL OF DISTUTILS ---
+if sys.version_info >= (3, 12):
+    try:
+        import setuptools
+    except ImportError:
+        pass
+# ----------------------------------------------------
+
+import undetected_chromedriver as uc
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import Select
+from selenium.common.exceptions import WebDriverException, SessionNotCreatedException, TimeoutException
+from rumble_drivers import DriverVersionError, mismatch_version
+from rumble_edit import DirectEditor, SaveFailedError, save_error, FORM_SNAPSHOT_JS, FORM_READY_JS, CLOSE_MODAL_JS, \
+    WATCH_SAVE_JS, SAVE_STATE_JS
+from rumble_retry import classify, RETRYABLE, SESSION
+from rumble_rules import plan_changes
+from rumble_scan import extract_rows, is_login_url, RUMBLE_BASE, LISTING_URL, FIND_TRIGGER_JS, SessionExpiredError
+
+WAIT_POLL = 0.1
+# Tabs of a shared browser sit in the background; keep their timers and
+# rendering at full speed so waits don't stall.
+TAB_FLAGS = ("--disable-background-timer-throttling", "--disable-backgrounding-occluded-windows",
+             "--disable-renderer-backgrounding")
+
+
+# --- DRIVER FACTORY (AUTO-HEAL) ---
+def enable_perf_log(options):
+    # Network events only; drained by the worker after every page
+    options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
+
+
+def get_driver(headless=False, binary_path="", force_version=None, driver_path=None, log=print, tabs=False,
+               perf_log=False):
+    options = uc.ChromeOptions()
+    if headless:
+        options.add_argument("--headless=new")
+    options.add_argument("--start-maximized")
+    options.add_argument("--disable-popup-blocking")
+    if headless:
+        options.add_argument("--blink-settings=imagesEnabled=false")
+    if tabs:
+        for flag in TAB_FLAGS:
+            options.add_argument(flag)
+    if perf_log:
+        enable_perf_log(options)
+
+    if binary_path:
+        options.binary_location = binary_path
+
+    try:
+        if force_version:
+            log(f"Attempting driver launch (Version {force_version})...")
+            driver = uc.Chrome(options=options, version_main=force_version)
+        elif driver_path:
+            driver = uc.Chrome(options=options, driver_executable_path=driver_path)
+        else:
+            driver = uc.Chrome(options=options)
+        return driver
+
+    except SessionNotCreatedException as e:
+        detected_version = mismatch_version(str(e))
+        if detected_version:
+            log("Driver Version Mismatch Detected.")
+            # A driver from the store is swapped by the caller (once for all workers)
+            if driver_path: raise DriverVersionError(detected_version, str(e).splitlines()[0])
+            log(f"Detected Browser Version: {detected_version}. Downgrading driver...")
+            return get_driver(headless, binary_path, force_version=detected_version, log=log, tabs=tabs,
+                              perf_log=perf_log)
+        raise e
+
+
+# --- TAB WORKERS ---
+# In "Tabs" mode several workers share one browser. Each worker gets its own
+# WebDriver session attached to the running browser over its DevTools address
+# and works in a tab of its own, so every worker still looks like a normal
+# driver to BrowserWorker but only costs a tab and a chromedriver process.
+class TabDriver(webdriver.Chrome):
+    on_quit = None
+    host = None  # the engine's record of the shared browser, set by the engine
+    shared_browser = True  # its processes belong to the host browser
+
+    def quit(self):
+        # Close only this worker's tab; the shared browser stays up
+        try:
+            self.close()
+        except Exception:
+            pass
+        try:
+            super().quit()
+        finally:
+            if self.on_quit: self.on_quit()
+
+
+def attach_tab(host, driver_path=None, headless=False, on_quit=None, perf_log=False):
+    options = webdriver.ChromeOptions()
+    options.debugger_address = host.capabilities["goog:chromeOptions"]["debuggerAddress"]
+    if perf_log: enable_perf_log(options)
+    tab = TabDriver(options=options, service=Service(driver_path) if driver_path else None)
+    tab.on_quit = on_quit
+    try:
+        tab.switch_to.new_window("tab")
+        tab.execute_cdp_cmd("Emulation.setFocusEmulationEnabled", {"enabled": True})
+        if headless:
+            # Same navigator.webdriver / user agent patches uc applies to its own headless driver
+            uc.Chrome._configure_headless(tab)
+    except Exception:
+        tab.quit()
+        raise
+    return tab
+
+
+def cdp_cookie(c):
+    # Selenium cookie dict -> DevTools Network.CookieParam
+    cookie = {"name": c["name"], "value": c["value"], "domain": c.get("domain", ".rumble.com"),
+              "path": c.get("path", "/"), "secure": c.get("secure", False), "httpOnly": c.get("httpOnly", False)}
+    if c.get("sameSite") in ("Strict", "Lax", "None"): cookie["sameSite"] = c["sameSite"]
+    if c.get("expiry"): cookie["expires"] = c["expiry"]
+    return cookie
+
+
+def load_cookies(driver, cookies_file):
+    # Set over DevTools before the first navigation, so the first page a
+    # worker loads is already logged in. Drivers without CDP fall back to
+    # visiting the site once and adding the cookies one by one.
+    if not os.path.exists(cookies_file): return
+    with open(cookies_file, "rb") as f:
+        cookies = pickle.load(f)
+    try:
+        driver.execute_cdp_cmd("Network.setCookies", {"cookies": [cdp_cookie(c) for c in cookies]})
+        return
+    except Exception:
+        pass
+    driver.get(f"{RUMBLE_BASE}/404")
+    for c in cookies:
+        try:
+            driver.add_cookie(c)
+        except:
+            pass
+
+
+def apply_blocklist(driver, patterns):
+    # Refused inside the browser; an empty list lifts any earlier blocking
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(patterns)})
+
+
+def save_user_agent(driver, ua_file):
+    # HTTP scan mode reuses the login browser's UA alongside its cookies
+    try:
+        ua = driver.execute_script("return navigator.userAgent")
+        with open(ua_file, "w") as f:
+            f.write(ua.replace("HeadlessChrome", "Chrome"))
+    except:
+        pass
+
+
+# --- EDIT MODAL WAITS ---
+# Every step waits for the condition it needs (polled every WAIT_POLL) up to
+# the configured ceiling instead of sleeping a fixed time.
+def wait(driver, condition, timeout):
+    return WebDriverWait(driver, timeout, poll_frequency=WAIT_POLL).until(condition)
+
+
+def open_edit_modal(driver, trigger, timeout):
+    driver.execute_script("arguments[0].click();", trigger)
+    edit_btn = wait(driver, EC.element_to_be_clickable((By.CSS_SELECTOR, ".dd-menu[style*='block'] #edit")), timeout)
+    driver.execute_script("arguments[0].click();", edit_btn)
+    wait(driver, EC.visibility_of_element_located((By.ID, "video-form")), timeout)
+    wait(driver, lambda d: d.execute_script(FORM_READY_JS), timeout)
+
+
+def open_tab(driver, tab, timeout):
+    # Tab is switched once it is marked active and its field can be used
+    tab_el = driver.find_element(By.CSS_SELECTOR, f"li[data-tab='{tab}']")
+    if "active" not in (tab_el.get_attribute("class") or ""):
+        driver.execute_script("arguments[0].click();", tab_el)
+        wait(driver, lambda d: "active" in (tab_el.get_attribute("class") or ""), timeout)
+    field = "channelId" if tab == "settings" else "tags"
+    wait(driver, EC.visibility_of_element_located((By.ID, field)), timeout)
+
+
+def close_modal(driver, timeout):
+    try:
+        driver.execute_script(CLOSE_MODAL_JS)
+        wait(driver, EC.invisibility_of_element_located((By.ID, "video-form")), timeout)
+        return True
+    except Exception:
+        return False
+
+
+def fetch_channels(driver, timeout):
+    # Channel names from the first video's edit modal (settings tab)
+    driver.get(f"{RUMBLE_BASE}/account/content")
+    triggers = WebDriverWait(driver, 10).until(
+        EC.presence_of_all_elements_located((By.CSS_SELECTOR, ".my-videos-nav .open-menu")))
+    if not triggers: return []
+    open_edit_modal(driver, triggers[0], timeout)
+    open_tab(driver, "settings", timeout)
+    select = Select(driver.find_element(By.ID, "channelId"))
+    return [o.text for o in select.options]
+
+
+class BrowserWorker:
+    # One swarm worker bound to one driver; run state, logging and metrics
+    # belong to the engine.
+    def __init__(self, engine, worker_id, driver):
+        self.engine = engine
+        self.worker_id = worker_id
+        self.driver = driver
+        self.retired = False
+        self.recycle_reason = None
+        self.left_page = False  # a moved video was followed to another listing page
+        self.open_seconds = 0  # how long the last video's edit form took to open
+
+    def _recycle(self):
+        # Between two tasks only; False when no replacement driver came up
+        reason, self.recycle_reason = self.recycle_reason, None
+        return self.engine.recycle_driver(self, reason)
+
+    def _retire(self):
+        if not self.engine.should_retire(): return False
+        self.retired = True
+        self.engine.log(f"[W{self.worker_id}] Retiring (concurrency lowered).", self.worker_id, action="worker_retired")
+        return True
+
+    def _drain_network(self):
+        try:
+            self.engine.net_stats.add_log(self.driver.get_log("performance"))
+        except Exception:
+            pass
+
+    def _running(self):
+        return self.engine.is_running
+
+    def _retrying(self, page_num):
+        def on_retry(attempt, kind, e):
+            self.engine.log(f"[W{self.worker_id}] Pg {page_num}: {kind} error, retry {attempt} after backoff.",
+                            self.worker_id, page_num, action="retry")
+        return on_retry
+
+    def _load_listing(self, page_num):
+        self.driver.get(LISTING_URL.format(page=page_num))
+        if self._wait_for_listing(10): return
+        if is_login_url(self.driver.current_url):
+            raise SessionExpiredError(f"Page {page_num} redirected to the login page.")
+        raise TimeoutException("Listing did not load.")
+
+    def _wait_for_listing(self, timeout=5):
+        try:
+            with self.engine.metrics.phase(self.worker_id, "wait_selector"):
+                WebDriverWait(self.driver, timeout).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, ".my-videos-nav")))
+            return True
+        except:
+            return False
+
+    def scan_task(self, dry_run):
+        # Scanner: reads listing pages and queues their matches for the editors
+        engine, worker_id, driver = self.engine, self.worker_id, self.driver
+        while engine.is_running:
+            if self.recycle_reason:
+                if not self._recycle(): break
+                driver = self.driver
+            try:
+                page_num = engine.page_queue.get(timeout=1)
+            except queue.Empty:
+                break
+
+            if engine._past_end(page_num): continue
+            if not engine.session_ok(): break
+
+            try:
+                engine.log(f"[W{worker_id}] Scanning Page {page_num}...", worker_id, page_num, action="page")
+                with engine.metrics.phase(worker_id, "page_load"):
+                    engine.retry.call(lambda: driver.get(LISTING_URL.format(page=page_num)), self._running,
+                                      self._retrying(page_num))
+
+                if not self._wait_for_listing():
+                    # A slow page gets one reload with a longer wait before it counts as empty
+                    with engine.metrics.phase(worker_id, "page_load"):
+                        driver.refresh()
+                    if not self._wait_for_listing(15):
+                        if is_login_url(driver.current_url):
+                            engine.session_lost(f"[W{worker_id}] Page {page_num} redirected to the login page.")
+                            break
+                        if engine.last_pg is not None and page_num <= engine.last_pg:
+                            engine.log(f"[W{worker_id}] Page {page_num} did not load. Skipping.", worker_id, page_num,
+                                       action="page_error")
+                            engine.run_errors += 1
+                            engine.retry.record(False, "timeout")
+                            continue
+                        engine.log(f"[W{worker_id}] Page {page_num} empty. Later pages are skipped.", worker_id,
+                                   page_num, action="page_empty")
+                        with engine.state_lock:
+                            if engine.empty_page is None or page_num < engine.empty_page:
+                                engine.empty_page = page_num
+                        continue
+
+                engine._mark_first_page()
+                with engine.metrics.phase(worker_id, "parse"):
+                    rows = engine._apply_watermark(page_num, extract_rows(driver))
+                    to_process = engine.match_rows(f"W{worker_id}", rows, page_num)
+                engine.enqueue_videos(page_num, to_process)
+
+            except Exception as e:
+                if classify(e) == SESSION:
+                    engine.session_lost(f"[W{worker_id}] {e}")
+                    break
+                engine.log(f"[W{worker_id}] Error Pg {page_num} ({classify(e)}): {str(e).splitlines()[0]}", worker_id,
+                           page_num, action="page_error")
+                engine.run_errors += 1
+            finally:
+                self._drain_network()
+                self.recycle_reason = engine.governor.task_done(driver)
+
+        engine.log(f"[W{worker_id}] Finished.", worker_id, action="worker_done")
+
+    def edit_task(self, dry_run):
+        # Editor: takes single videos from the queue, preferring the page it
+        # already has open; a listing is only loaded when the video is elsewhere
+        engine, worker_id, driver = self.engine, self.worker_id, self.driver
+        current_page = None
+        while engine.is_running and not self._retire():
+            if self.recycle_reason:
+                if not self._recycle(): break
+                driver, current_page = self.driver, None
+            row = engine.video_queue.get(prefer=current_page)
+            if row is None:
+                if engine.video_queue.done(): break
+                continue
+            if not engine.session_ok(): break
+
+            page_num = row["page"]
+            ok = False
+            try:
+                if page_num != current_page:
+                    engine.log(f"[W{worker_id}] Editing Page {page_num}...", worker_id, page_num, action="edit_page")
+                    current_page = None
+                    with engine.metrics.phase(worker_id, "page_load"):
+                        engine.retry.call(lambda: self._load_listing(page_num), self._running,
+                                          self._retrying(page_num))
+                    current_page = page_num
+                    engine._mark_first_page()
+                ok = self.process_matches_on_page([row], dry_run)
+                engine.page_result(self.open_seconds, ok)
+                # Whatever went wrong, the next video starts from a fresh listing
+                if not ok or self.left_page: current_page = None
+                self.left_page = False
+            except Exception as e:
+                if classify(e) == SESSION:
+                    engine.session_lost(f"[W{worker_id}] {e}")
+                    break
+                engine.log(f"[W{worker_id}] Error Pg {page_num} ({classify(e)}): {str(e).splitlines()[0]}", worker_id,
+                           page_num, action="page_error")
+                engine.run_errors += 1
+                engine.page_result(0, False)
+                current_page = None
+            finally:
+                engine.video_finished(row, ok)
+                self._drain_network()
+                self.recycle_reason = engine.governor.task_done(driver)
+
+        engine.log(f"[W{worker_id}] Finished.", worker_id, action="worker_done")
+
+    def process_matches_on_page(self, rows, dry_run):
+        # Videos are addressed by id and edited one after another on the same
+        # listing; the page is only reloaded after something went wrong.
+        # Returns True when every video reached an outcome.
+        engine, worker_id, driver = self.engine, self.worker_id, self.driver
+        need_reload = False
+        complete = True
+        for row in rows:
+            if not engine.is_running: return False
+            success, error = False, None
+            position, located = row["position"], False
+            opened_at = time.perf_counter()
+            for attempt in range(engine.retry.attempts):
+                if not engine.breaker.wait(self._running): return False
+                try:
+                    if need_reload:
+                        driver.refresh()
+                        WebDriverWait(driver, 10).until(
+                            EC.presence_of_element_located((By.CSS_SELECTOR, ".my-videos-nav")))
+                        need_reload = False
+                    trigger = driver.execute_script(FIND_TRIGGER_JS, row["video_id"], position, row["title"])
+                    if trigger is None and not located:
+                        located = True
+                        found = engine.locate_video(row)
+                        if found:
+                            engine.log(f"[W{worker_id}] Video {row['video_id']} moved to page {found[0]}.", worker_id,
+                                       row.get("page"), row["video_id"], "moved")
+                            self.left_page = True
+                            self._load_listing(found[0])
+                            position, opened_at = found[1], time.perf_counter()
+                            trigger = driver.execute_script(FIND_TRIGGER_JS, row["video_id"], position, row["title"])
+                    if trigger is None:
+                        engine.log(f"[W{worker_id}] Video {row['video_id'] or row['position']} not found on page "
+                                   f"{row.get('page')} or the pages around it. Skipping.",
+                                   worker_id, row.get("page"), row["video_id"], "not_found")
+                        engine.video_done(row, "not_found")
+                        break
+                    driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", trigger)
+                    open_edit_modal(driver, trigger, engine.wait_ceiling)
+                    engine.retry.record(True)
+                    success = True
+                    break
+                except Exception as e:
+                    kind = classify(e)
+                    # A lost login stops the run; edit_task reports it
+                    if kind == SESSION: raise
+                    engine.retry.record(False, kind)
+                    error = (kind, e)
+                    if kind not in RETRYABLE: break
+                    # The reload on the next attempt waits for the listing itself
+                    need_reload = True
+                    if attempt < engine.retry.attempts - 1: engine.retry.sleep(attempt, self._running)
+
+            if not success:
+                if error:
+                    kind, e = error
+                    engine.log(f"[W{worker_id}] Could not open video {row['video_id'] or row['position']} ({kind}): "
+                               f"{str(e).splitlines()[0]}", worker_id, row.get("page"), row["video_id"], "edit_error")
+                complete = False
+                continue
+            self.open_seconds = time.perf_counter() - opened_at
+            engine.metrics.record(worker_id, "modal_open", self.open_seconds)
+
+            try:
+                self.edit_open_video(row, dry_run)
+                if not close_modal(driver, engine.wait_ceiling): need_reload = True
+            except Exception as e:
+                if classify(e) == SESSION: raise
+                engine.retry.record(False, classify(e))
+                engine.log(f"[W{worker_id}] Edit Glitch: {str(e).splitlines()[0]}", worker_id, row.get("page"),
+                           row["video_id"], "edit_error")
+                need_reload = True
+                complete = False
+        return complete
+
+    def edit_open_video(self, row, dry_run):
+        engine, worker_id = self.engine, self.worker_id
+        # 1. Read the form in one call (falls back to tab-by-tab reads)
+        with engine.metrics.phase(worker_id, "field_read"):
+            snapshot = self._snapshot_form()
+            if snapshot:
+                title_val, current_tags = snapshot["title"], snapshot["tags"]
+                current_cat, current_chan = snapshot["category"], snapshot["channel"]
+            else:
+                title_val, current_tags, current_cat, current_chan = self._read_form_modal()
+
+        # 2. Find Rule Match (an apply run uses the rule its plan recorded)
+        entry = row.get("plan")
+        target_rule = entry["rule"] if entry else engine.matcher.match(title_val, current_cat)
+        engine.inventory.record_state(row["video_id"], current_cat, current_chan, current_tags)
+
+        if not target_rule:
+            engine.video_done(row, "no_rule")
+            return
+
+        # 3. Calculate Changes
+        new_chan, new_tags = plan_changes(target_rule, current_chan, current_tags)
+        if entry and (new_chan or new_tags is not None) and (new_chan, new_tags) != (entry["target_channel"], entry["target_tags"]):
+            engine.log(f"[W{worker_id}] -> Changed since the plan was made. Skipped, plan again.", worker_id,
+                       row.get("page"), row["video_id"], "stale")
+            engine.video_done(row, "stale")
+            return
+
+        if new_chan or new_tags is not None:
+            log_items = []
+            if new_chan: log_items.append(f"Channel -> {new_chan}")
+            if new_tags is not None: log_items.append(f"Tags -> {new_tags[:15] or '(none)'}...")
+            engine.log(f"[W{worker_id}] Updating: {', '.join(log_items)}", worker_id, row.get("page"),
+                       row["video_id"], "update")
+
+            if not dry_run:
+                # 4. Save (direct form submit first, modal as fallback)
+                save_started = time.perf_counter()
+                if engine.edit_mode == "Direct" and snapshot and self._direct_save(snapshot, new_chan, new_tags):
+                    engine.log(f"[W{worker_id}] -> Saved (direct).", worker_id, row.get("page"), row["video_id"],
+                               "saved")
+                else:
+                    new_chan = self._modal_save(new_chan, new_tags)
+                    engine.log(f"[W{worker_id}] -> Saved.", worker_id, row.get("page"), row["video_id"], "saved")
+                engine.metrics.record(worker_id, "save", time.perf_counter() - save_started)
+                engine.inventory.record_state(row["video_id"], current_cat, new_chan or current_chan,
+                                              current_tags if new_tags is None else new_tags, edited=True)
+                engine.video_done(row, "saved")
+            else:
+                engine.plan_change(row, target_rule, current_cat, current_chan, current_tags, new_chan, new_tags)
+                engine.log(f"[W{worker_id}] -> Planned (dry run).", worker_id, row.get("page"), row["video_id"],
+                           "planned")
+        else:
+            engine.check_tags(target_rule, current_tags)
+            engine.log(f"[W{worker_id}] -> Already correct.", worker_id, row.get("page"), row["video_id"], "correct")
+            engine.video_done(row, "correct")
+
+    def _snapshot_form(self):
+        try:
+            return self.driver.execute_script(FORM_SNAPSHOT_JS)
+        except WebDriverException:
+            return None
+
+    def _read_form_modal(self):
+        driver, ceiling = self.driver, self.engine.wait_ceiling
+        # Grab Details from DETAILS tab (default)
+        try:
+            open_tab(driver, "details", ceiling)
+        except:
+            pass
+
+        title_val = driver.find_element(By.ID, "title").get_attribute("value")
+        current_tags = driver.find_element(By.ID, "tags").get_attribute("value")
+
+        cat_select = Select(driver.find_element(By.ID, "siteChannelId"))
+        current_cat = cat_select.first_selected_option.text
+
+        # Switch to Settings to get Channel
+        open_tab(driver, "settings", ceiling)
+
+        chan_select = Select(driver.find_element(By.ID, "channelId"))
+        current_chan = chan_select.first_selected_option.text
+        return title_val, current_tags, current_cat, current_chan
+
+    def _direct_save(self, snapshot, new_chan, new_tags):
+        engine, worker_id = self.engine, self.worker_id
+        editor = engine.direct_editors.get(worker_id)
+        if editor is None:
+            editor = DirectEditor(engine.user_agent)
+            engine.direct_editors[worker_id] = editor
+        if editor.disabled: return False
+        try:
+            editor.sync_cookies(self.driver.get_cookies())
+            editor.submit(snapshot, target_channel=new_chan, target_tags=new_tags)
+            return True
+        except Exception as e:
+            engine.log(f"[W{worker_id}] Direct save failed ({str(e).splitlines()[0]}). Using edit modal.")
+            if editor.disabled:
+                engine.log(f"[W{worker_id}] Direct saves are never confirmed here. Using the edit modal from now on.")
+            return False
+
+    def _modal_save(self, new_chan, new_tags):
+        engine, worker_id, driver = self.engine, self.worker_id, self.driver
+        # Apply Channel (Settings Tab)
+        if new_chan:
+            open_tab(driver, "settings", engine.wait_ceiling)
+            chan_select = Select(driver.find_element(By.ID, "channelId"))
+            try:
+                chan_select.select_by_visible_text(new_chan)
+            except:
+                found = False
+                for opt in chan_select.options:
+                    if new_chan.lower() in opt.text.lower():
+                        chan_select.select_by_visible_text(opt.text)
+                        found = True
+                        break
+                if not found:
+                    engine.log(f"[W{worker_id}] Warn: Target channel '{new_chan}' not found.")
+                    new_chan = None
+
+        # Apply Tags (Details Tab); "" clears every tag
+        if new_tags is not None:
+            open_tab(driver, "details", engine.wait_ceiling)
+            tags_input = driver.find_element(By.ID, "tags")
+            tags_input.clear()
+            if new_tags: tags_input.send_keys(new_tags)
+
+        # Save, then wait for the save request to answer (or the modal to close)
+        save_btn = driver.find_element(By.CSS_SELECTOR, ".overlay-dialog .buttons [id='0']")
+        driver.execute_script(WATCH_SAVE_JS)
+        driver.execute_script("arguments[0].click();", save_btn)
+        with engine.metrics.phase(worker_id, "save_confirm"):
+            self._confirm_save()
+        return new_chan
+
+    def _confirm_save(self):
+        def settled(d):
+            state = d.execute_script(SAVE_STATE_JS)
+            return state if state["done"] or not state["form_open"] else False
+
+        ceiling = self.engine.wait_ceiling
+        try:
+            state = wait(self.driver, settled, ceiling)
+        except TimeoutException:
+            raise SaveFailedError(f"Save not confirmed within {ceiling:g}s.")
+        if state["done"]:
+            if not 200 <= (state["status"] or 0) < 400:
+                raise SaveFailedError(f"Save request returned HTTP {state['status']}.")
+            error = save_error(state["body"])
+            if error:
+                raise SaveFailedError(f"Save rejected: {error}")
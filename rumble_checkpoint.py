@@ -0,0 +1,88 @@
+# --- RUN CHECKPOINT ---
+# Durable progress of the current swarm run: the run's settings and page
+# range, every listing page that was fully handled and the outcome of every
+# video that reached one. A run that is stopped, crashes or has its window
+# closed stays "unfinished" here and can be resumed: only the remaining pages
+# are queued and videos that already have an outcome are not opened again.
+import json
+import sqlite3
+import threading
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS run (
+    id       INTEGER PRIMARY KEY CHECK (id = 1),
+    started  REAL,
+    settings TEXT,
+    last_pg  INTEGER,
+    finished REAL
+);
+CREATE TABLE IF NOT EXISTS pages (
+    page    INTEGER PRIMARY KEY,
+    updated REAL
+);
+CREATE TABLE IF NOT EXISTS outcomes (
+    video_id TEXT PRIMARY KEY,
+    page     INTEGER,
+    outcome  TEXT,
+    updated  REAL
+);
+"""
+
+
+class RunCheckpoint:
+    def __init__(self, path):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    def begin(self, settings):
+        with self._lock:
+            self._conn.execute("DELETE FROM pages")
+            self._conn.execute("DELETE FROM outcomes")
+            self._conn.execute("INSERT OR REPLACE INTO run (id, started, settings, last_pg, finished) "
+                               "VALUES (1, ?, ?, NULL, NULL)", (time.time(), json.dumps(settings)))
+            self._conn.commit()
+
+    def set_last_page(self, last_pg):
+        with self._lock:
+            self._conn.execute("UPDATE run SET last_pg = ? WHERE id = 1", (last_pg,))
+            self._conn.commit()
+
+    def page_done(self, page):
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO pages (page, updated) VALUES (?, ?)", (page, time.time()))
+            self._conn.commit()
+
+    def video_outcome(self, video_id, page, outcome):
+        if not video_id: return
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO outcomes (video_id, page, outcome, updated) "
+                               "VALUES (?, ?, ?, ?)", (video_id, page, outcome, time.time()))
+            self._conn.commit()
+
+    def finish(self):
+        with self._lock:
+            self._conn.execute("UPDATE run SET finished = ? WHERE id = 1", (time.time(),))
+            self._conn.commit()
+
+    def load(self):
+        # Last run's state, or None if there never was one
+        with self._lock:
+            run = self._conn.execute("SELECT started, settings, last_pg, finished FROM run WHERE id = 1").fetchone()
+            if not run: return None
+            pages = {p for (p,) in self._conn.execute("SELECT page FROM pages")}
+            outcomes = dict(self._conn.execute("SELECT video_id, outcome FROM outcomes"))
+        return {"started": run[0], "settings": json.loads(run[1]), "last_pg": run[2], "finished": run[3],
+                "pages": pages, "outcomes": outcomes}
+
+    def resumable(self):
+        with self._lock:
+            row = self._conn.execute("SELECT finished FROM run WHERE id = 1").fetchone()
+        return bool(row) and row[0] is None
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,138 @@
+# --- HEADLESS CLI ---
+# Runs the swarm without the GUI, for schedulers and servers. Reads the same
+# rules / settings / cookies files the app writes (log in once with the app),
+# prints the log to stdout and exits with a summary:
+#   0 = finished without errors, 1 = finished with errors or stopped, 2 = setup problem
+#
+#   python rumble_cli.py --dry-run
+#   python rumble_cli.py --apply --threads 8 --scan-mode HTTP
+#   python rumble_cli.py --apply --incremental --interval 60     (daemon: run every hour)
+#   python rumble_cli.py --resume                                 (continue an interrupted run)
+#   python rumble_cli.py --apply-plan plans/plan_20250101_120000.json (apply a dry run's plan)
+#
+# Engine modules are imported after argument parsing and browser modules only
+# when a browser worker starts, so --help and setup errors return immediately.
+import argparse
+import os
+import sys
+import threading
+import time
+
+
+def parse_args(argv=None):
+    ap = argparse.ArgumentParser(description="Run the Rumble Manager swarm without the GUI. Options left out fall "
+                                             "back to the values saved by the app.")
+    mode = ap.add_mutually_exclusive_group()
+    mode.add_argument("--dry-run", dest="dry", action="store_true", default=None,
+                      help="match and read, never save; writes a change plan to plans/")
+    mode.add_argument("--apply", dest="dry", action="store_false", help="save changes")
+    mode.add_argument("--apply-plan", metavar="PLAN", help="apply only the changes in a plan written by a dry run")
+    ap.add_argument("--threads", type=int, help="editor browsers (1-20)")
+    ap.add_argument("--scan-threads", type=int, help="scanner browsers in Browser scan mode (default 2)")
+    ap.add_argument("--start-page", type=int)
+    ap.add_argument("--scan-mode", choices=["Browser", "HTTP"])
+    ap.add_argument("--edit-mode", choices=["Direct", "Modal"])
+    ap.add_argument("--incremental", action=argparse.BooleanOptionalAction, default=None)
+    ap.add_argument("--skip-verified", action=argparse.BooleanOptionalAction, default=None)
+    ap.add_argument("--adaptive", action=argparse.BooleanOptionalAction, default=None,
+                    help="start small and grow/shrink the editor count up to --threads")
+    ap.add_argument("--browser-mode", choices=["Processes", "Tabs"],
+                    help="one browser per worker, or workers as tabs of a few shared browsers")
+    ap.add_argument("--block-profile", choices=["Safe", "Off"],
+                    help="requests refused by worker browsers (extra entries: rumble_blocklist.txt)")
+    ap.add_argument("--recycle-mb", type=float, help="relaunch a worker's browser past this RSS (0 = never)")
+    ap.add_argument("--recycle-pages", type=int, help="relaunch a worker's browser after this many pages (0 = never)")
+    ap.add_argument("--memory-budget", type=float, metavar="MB",
+                    help="memory all worker browsers may use together (0 = 60%% of RAM)")
+    ap.add_argument("--wait-ceiling", type=float, help="seconds, upper bound for any wait in the edit flow")
+    ap.add_argument("--resume", action="store_true",
+                    help="continue the last interrupted run: only unfinished pages, done videos are skipped")
+    ap.add_argument("--headed", action="store_true", help="show the browsers (default: headless)")
+    ap.add_argument("--interval", type=float, default=0, help="daemon mode: repeat every N minutes until stopped")
+    ap.add_argument("--quiet", action="store_true", help="only print the summary")
+    return ap.parse_args(argv)
+
+
+def build_settings(args, saved):
+    settings = dict(saved)
+    overrides = {"dry": args.dry, "threads": args.threads, "scan_threads": args.scan_threads,
+                 "start_page": args.start_page,
+                 "scan_mode": args.scan_mode, "edit_mode": args.edit_mode, "incremental": args.incremental,
+                 "skip_verified": args.skip_verified, "adaptive": args.adaptive,
+                 "wait_ceiling": args.wait_ceiling, "browser_mode": args.browser_mode,
+                 "block_profile": args.block_profile, "recycle_mb": args.recycle_mb,
+                 "recycle_pages": args.recycle_pages, "memory_budget_mb": args.memory_budget}
+    settings.update((k, v) for k, v in overrides.items() if v is not None)
+    settings["head"] = not args.headed
+    return settings
+
+
+def run_once(engine, rules, settings, quiet, resume=False, plan_path=None):
+    done = threading.Event()
+    engine.on_done = done.set
+    if engine.start(rules, settings, resume=resume, plan_path=plan_path) is None:
+        for r in engine.run_log.drain():
+            print(r["msg"], file=sys.stderr)
+        return 2
+    try:
+        while not done.wait(0.2):
+            for r in engine.run_log.drain():
+                if not quiet: print(r["msg"], flush=True)
+    except KeyboardInterrupt:
+        engine.stop()
+        print("Interrupted, waiting for workers to finish their current video...", flush=True)
+        while not done.wait(0.5):
+            pass
+    for r in engine.run_log.drain():
+        if not quiet: print(r["msg"], flush=True)
+    engine.run_log.end_run()
+
+    s = engine.summary()
+    status = "Finished" if s["completed"] else "Stopped" if s["stopped"] else "Incomplete"
+    print(f"{status} in {s['elapsed']:.0f}s: {s['pages']} pages, "
+          f"{s['matches']} matches ({s['verified']} verified from inventory), {s['updates']} updates, "
+          f"{s['saved']} saved, {s['correct']} already correct, {s['saves_avoided']} saves avoided, "
+          f"{s['planned']} planned, {s['stale']} stale, {s['moved']} moved, {s['not_found']} not found, "
+          f"{s['resumed']} done before interruption, {s['retries']} retries, {s['breaker_trips']} breaker trips, {s['recycled']} browsers recycled, "
+          f"{s['errors']} errors. Log: {engine.run_log.path}",
+          flush=True)
+    return 0 if s["completed"] and not s["errors"] else 1
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    from rumble_engine import SwarmEngine, load_settings, load_rules, COOKIES_FILE
+    if not os.path.exists(COOKIES_FILE):
+        print(f"No saved session ({COOKIES_FILE}). Log in once with the app first.", file=sys.stderr)
+        return 2
+    rules = load_rules()
+    if not rules:
+        print("No rules. Add rules with the app first.", file=sys.stderr)
+        return 2
+
+    settings = build_settings(args, load_settings())
+    workers = f"up to {int(settings['threads'])} adaptive" if settings["adaptive"] else int(settings["threads"])
+    scanners = f"{int(settings['scan_threads'])} scanners + " if settings["scan_mode"] == "Browser" else ""
+    action = f"APPLYING plan {args.apply_plan}" if args.apply_plan else \
+        "dry run (plan only)" if settings["dry"] else "APPLYING changes"
+    print(f"{len(rules)} rules, {action}, "
+          f"{scanners}{workers} editors as {settings['browser_mode'].lower()}, {settings['scan_mode']} scan.", flush=True)
+
+    engine = SwarmEngine()
+    try:
+        while True:
+            # Only the first run of a daemon resumes; later runs start fresh
+            code = run_once(engine, rules, settings, args.quiet, resume=args.resume, plan_path=args.apply_plan)
+            args.resume = False
+            if not args.interval or engine.stop_requested: return code
+            print(f"Next run in {args.interval:g} min.", flush=True)
+            time.sleep(args.interval * 60)
+    except KeyboardInterrupt:
+        return 1
+    finally:
+        engine.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
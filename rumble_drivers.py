@@ -0,0 +1,105 @@
+# --- PATCHED DRIVER STORE ---
+# undetected_chromedriver downloads and patches a chromedriver on every
+# uc.Chrome() call unless it is handed a ready binary, and every worker that
+# hits a version mismatch used to heal itself by downloading again. The store
+# keeps one patched binary per browser major version (drivers/chromedriver_<N>)
+# and resolves it under a lock, so a swarm downloads at most once per version
+# and workers never race on a half-written file: a binary is patched under a
+# temporary name and moved into place when complete.
+import os
+import re
+import subprocess
+import threading
+
+VERSION_RE = re.compile(r"(\d+)\.\d+\.\d+(?:\.\d+)?")
+MISMATCH_RE = re.compile(r"Current browser version is (\d+)")
+EXE = ".exe" if os.name == "nt" else ""
+WINDOWS_VERSION_DIRS = ("chrome.exe", "brave.exe")  # version folders named <chromium major>.x.y.z
+
+
+class DriverVersionError(Exception):
+    # The browser is a different major version than the driver it was started with
+    def __init__(self, version, msg=""):
+        super().__init__(msg or f"Browser version is {version}.")
+        self.version = version
+
+
+def mismatch_version(msg):
+    # Browser major version from a chromedriver "only supports Chrome version" error, else None
+    if "This version of ChromeDriver only supports Chrome version" not in msg: return None
+    match = MISMATCH_RE.search(msg)
+    return int(match.group(1)) if match else None
+
+
+def browser_version(binary_path=""):
+    # Major version of the browser (uc's default Chrome when no path), None if unknown.
+    # Only a hint: a mismatch reported by the driver always wins.
+    if not binary_path:
+        try:
+            from undetected_chromedriver import find_chrome_executable
+            binary_path = find_chrome_executable() or ""
+        except Exception:
+            binary_path = ""
+    if not binary_path or not os.path.exists(binary_path): return None
+    if os.name == "nt":
+        # Windows browsers ignore --version and start a window instead, so only
+        # the per-version folders next to the executable are read. Chrome's and
+        # Brave's start with the Chromium major version; Opera's and Vivaldi's
+        # carry their own numbering, so those are left to the mismatch path.
+        if os.path.basename(binary_path).lower() not in WINDOWS_VERSION_DIRS: return None
+        try:
+            found = [VERSION_RE.fullmatch(d) for d in os.listdir(os.path.dirname(binary_path))]
+        except OSError:
+            return None
+        majors = [int(m.group(1)) for m in found if m]
+        return max(majors) if majors else None
+    try:
+        out = subprocess.run([binary_path, "--version"], capture_output=True, text=True, timeout=15).stdout
+    except Exception:
+        return None
+    match = VERSION_RE.search(out or "")
+    return int(match.group(1)) if match else None
+
+
+def is_patched(path):
+    # uc leaves this marker in every binary it patched
+    try:
+        with open(path, "rb") as f:
+            return f.read().find(b"undetected chromedriver") != -1
+    except OSError:
+        return False
+
+
+class DriverStore:
+    def __init__(self, root):
+        self.root = root
+        self._lock = threading.Lock()
+
+    def path_for(self, version):
+        return os.path.abspath(os.path.join(self.root, f"chromedriver_{version}{EXE}"))
+
+    def cached(self, version):
+        path = self.path_for(version)
+        return path if is_patched(path) else None
+
+    def resolve(self, version=None, log=print):
+        # (path, major version) of a patched driver; version None means the latest stable
+        with self._lock:
+            if version:
+                path = self.cached(version)
+                if path: return path, version
+            from undetected_chromedriver.patcher import Patcher
+            os.makedirs(self.root, exist_ok=True)
+            tmp = os.path.abspath(os.path.join(self.root, f".chromedriver_{os.getpid()}{EXE}"))
+            patcher = Patcher(executable_path=tmp, version_main=version or 0)
+            patcher.zip_path = tmp + "_zip"
+            release = patcher.fetch_release_number()
+            patcher.version_main = release.version[0]
+            patcher.version_full = release
+            path = self.path_for(patcher.version_main)
+            if self.cached(patcher.version_main): return path, patcher.version_main
+            log(f"Drivers: downloading chromedriver {release.vstring} (kept in {self.root}/ for later runs)...")
+            patcher.unzip_package(patcher.fetch_package())
+            patcher.patch()
+            os.replace(tmp, path)
+            return path, patcher.version_main
@@ -0,0 +1,219 @@
+# --- DIRECT EDIT BACKEND ---
+# Instead of flipping between the modal's details/settings tabs and clicking
+# save, the open #video-form is serialized once with a single script call and
+# the change is posted straight to the form's action over an HTTP session that
+# carries the worker browser's cookies. A save only counts once the endpoint
+# answers with an explicit JSON success; anything else raises DirectEditError
+# so the caller falls back to driving the modal.
+import json
+from urllib.parse import urljoin
+
+from rumble_scan import make_session, set_session_cookies
+
+
+class DirectEditError(Exception):
+    pass
+
+
+class SaveFailedError(Exception):
+    pass
+
+
+# Returns everything the edit flow needs from the open modal, including fields
+# that sit on the inactive tab, without any clicking.
+FORM_SNAPSHOT_JS = """
+var form = document.getElementById('video-form');
+if (!form) return null;
+function el(id) { return document.getElementById(id); }
+function selText(s) { return (s && s.selectedIndex >= 0) ? s.options[s.selectedIndex].text : ''; }
+var fields = [];
+new FormData(form).forEach(function (v, k) { if (typeof v === 'string') fields.push([k, v]); });
+var title = el('title'), tags = el('tags'), cat = el('siteChannelId'), chan = el('channelId');
+return {
+    page_url: window.location.href,
+    action: form.getAttribute('action'),
+    method: (form.getAttribute('method') || 'post').toLowerCase(),
+    fields: fields,
+    names: {
+        title: title ? title.name : 'title',
+        tags: tags ? tags.name : 'tags',
+        category: cat ? cat.name : 'siteChannelId',
+        channel: chan ? chan.name : 'channelId'
+    },
+    title: title ? title.value : '',
+    tags: tags ? tags.value : '',
+    category: selText(cat),
+    channel: selText(chan),
+    channels: chan ? Array.prototype.map.call(chan.options, function (o) { return [o.text, o.value]; }) : []
+};
+"""
+
+
+# Dismisses the edit dialog so the next video can be opened from the same listing
+CLOSE_MODAL_JS = """
+var dlg = document.querySelector('.overlay-dialog');
+if (!dlg) return true;
+var btn = dlg.querySelector('.close, .overlay-close, .buttons [id="1"]');
+if (btn) { btn.click(); return true; }
+document.dispatchEvent(new KeyboardEvent('keydown', {key: 'Escape', keyCode: 27, bubbles: true}));
+return false;
+"""
+
+# True once the modal has been filled in by the site (title set, channel list loaded)
+FORM_READY_JS = """
+var form = document.getElementById('video-form');
+if (!form || !form.getClientRects().length) return false;
+var title = form.querySelector('#title'), chan = form.querySelector('#channelId');
+return !!(title && title.value && chan && chan.options.length);
+"""
+
+# Hooks fetch/XHR once per page and resets the record of the next request to
+# the edit form's action (the save endpoint), so the modal save is confirmed
+# from its actual response; beacons, analytics and blocked requests to other
+# URLs are ignored. URLs are compared without their query string.
+WATCH_SAVE_JS = """
+var w = window, form = document.getElementById('video-form');
+var endpoint = function (u) {
+    try { var a = new URL(u, location.href); return a.origin + a.pathname; } catch (e) { return null; }
+};
+w.__rcvmSave = {done: 0, status: null, body: null,
+                target: endpoint(form ? (form.getAttribute('action') || location.href) : location.href)};
+if (!w.__rcvmHooked) {
+    w.__rcvmHooked = true;
+    var isSave = function (u) { var s = w.__rcvmSave; return !!s.target && endpoint(u) === s.target; };
+    var record = function (status, body) {
+        var s = w.__rcvmSave; s.done++; s.status = status; s.body = (body || '').slice(0, 2000);
+    };
+    var open = XMLHttpRequest.prototype.open, send = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.open = function (method, url) {
+        this.__rcvmUrl = String(url);
+        this.__rcvmWrite = String(method).toUpperCase() !== 'GET';
+        return open.apply(this, arguments);
+    };
+    XMLHttpRequest.prototype.send = function () {
+        if (this.__rcvmWrite && isSave(this.__rcvmUrl)) this.addEventListener('loadend', function () {
+            var body = ''; try { body = String(this.responseText || ''); } catch (e) {}
+            record(this.status, body);
+        });
+        return send.apply(this, arguments);
+    };
+    if (w.fetch) {
+        var origFetch = w.fetch;
+        w.fetch = function (input, init) {
+            var method = (init && init.method) || (input && input.method) || 'GET';
+            var url = (input && input.url) || String(input);
+            var p = origFetch.apply(this, arguments);
+            if (String(method).toUpperCase() !== 'GET' && isSave(url)) p.then(function (r) {
+                r.clone().text().then(function (t) { record(r.status, t); }, function () { record(r.status, ''); });
+            }, function () { record(0, ''); });
+            return p;
+        };
+    }
+}
+return true;
+"""
+
+SAVE_STATE_JS = """
+var s = window.__rcvmSave || {}, form = document.getElementById('video-form');
+return {done: s.done || 0, status: s.status, body: s.body, form_open: !!(form && form.getClientRects().length)};
+"""
+
+
+def resolve_channel(channels, target_name):
+    # Same matching as the modal path: exact text first, then case-insensitive contains
+    for text, value in channels:
+        if text == target_name:
+            return text, value
+    for text, value in channels:
+        if target_name.lower() in text.lower():
+            return text, value
+    return None
+
+
+def save_error(body):
+    # Error message from a JSON save response, or None when it was accepted
+    try:
+        data = json.loads(body or "")
+    except ValueError:
+        return None
+    if isinstance(data, dict):
+        if data.get("success") is False or data.get("error") or data.get("errors"):
+            msg = data.get("error") or data.get("errors") or data.get("message") or "rejected"
+            return str(msg)[:80]
+    return None
+
+
+def save_confirmed(body):
+    # True only for a JSON reply that says the save went through; an HTML page
+    # or an empty 2xx proves nothing (it may be the listing or a login form)
+    try:
+        data = json.loads(body or "")
+    except ValueError:
+        return False
+    if not isinstance(data, dict) or save_error(body): return False
+    return data.get("success") is True or str(data.get("status", "")).lower() in ("ok", "success")
+
+
+class DirectEditor:
+    UNCONFIRMED_LIMIT = 3  # unconfirmed saves in a row (and none confirmed) before direct saves are given up
+
+    def __init__(self, user_agent="", timeout=15):
+        self.timeout = timeout
+        self.session = make_session(user_agent)
+        self.confirmed = 0
+        self.unconfirmed = 0
+
+    @property
+    def disabled(self):
+        return not self.confirmed and self.unconfirmed >= self.UNCONFIRMED_LIMIT
+
+    def sync_cookies(self, cookies):
+        set_session_cookies(self.session, cookies)
+
+    def submit(self, snapshot, target_channel=None, target_tags=None):
+        if not snapshot.get("action"):
+            raise DirectEditError("Edit form has no submit action.")
+
+        names = snapshot["names"]
+        changes = {}
+        if target_channel is not None:
+            hit = resolve_channel(snapshot["channels"], target_channel)
+            if not hit:
+                raise DirectEditError(f"Target channel '{target_channel}' not found.")
+            changes[names["channel"]] = hit[1]
+        if target_tags is not None:
+            changes[names["tags"]] = target_tags
+
+        payload = []
+        replaced = set()
+        for k, v in snapshot["fields"]:
+            if k in changes:
+                if k in replaced: continue
+                v = changes[k]
+                replaced.add(k)
+            payload.append((k, v))
+        for k, v in changes.items():
+            if k not in replaced: payload.append((k, v))
+
+        url = urljoin(snapshot["page_url"], snapshot["action"])
+        resp = self.session.request(snapshot["method"].upper(), url, data=payload, timeout=self.timeout,
+                                    headers={"X-Requested-With": "XMLHttpRequest",
+                                             "Referer": snapshot["page_url"]})
+
+        if "login" in resp.url:
+            raise DirectEditError("Session rejected by edit endpoint.")
+        if resp.status_code >= 400:
+            raise DirectEditError(f"Edit endpoint returned HTTP {resp.status_code}.")
+
+        # Validation errors come back as JSON when the form is submitted over XHR
+        error = save_error(resp.text)
+        if error:
+            raise DirectEditError(f"Edit rejected: {error}")
+        if not save_confirmed(resp.text):
+            self.unconfirmed += 1
+            raise DirectEditError(f"Save not confirmed (HTTP {resp.status_code}, no JSON success).")
+        self.confirmed += 1
+        return resp
+
+    def close(self):
+        self.session.close()
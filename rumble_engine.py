@@ -0,0 +1,1069 @@
+# --- SWARM ENGINE ---
+# A swarm run without any UI: page discovery, scanning, matching and the
+# browser worker pool. The Tk app and the headless CLI both drive this class
+# and only differ in how they show the log and when they stop. Browser code
+# (selenium / undetected_chromedriver) lives in rumble_browser and is only
+# imported when the first browser worker starts.
+import os
+import pickle
+import queue
+import threading
+import time
+from collections import Counter
+
+from rumble_adaptive import ConcurrencyController
+from rumble_checkpoint import RunCheckpoint
+from rumble_drivers import DriverStore, DriverVersionError, browser_version
+from rumble_governor import ResourceGovernor, RECYCLE_MB, RECYCLE_PAGES
+from rumble_inventory import VideoInventory
+from rumble_log import RunLog
+from rumble_metrics import RunMetrics
+from rumble_netblock import NetworkStats, block_patterns, load_blocklist
+from rumble_plan import ChangePlan, plan_entry, diff_plans, latest_plan
+from rumble_pool import DriverPool
+from rumble_queue import VideoQueue
+from rumble_retry import CircuitBreaker, RetryPolicy
+from rumble_rules import RuleMatcher, plan_changes, tag_save_avoided
+from rumble_scan import HttpScanner, SessionExpiredError
+
+# --- FILES ---
+COOKIES_FILE = "rumble_cookies.pkl"
+CHANNELS_FILE = "rumble_channels.pkl"
+RULES_FILE = "rumble_rules.pkl"
+SETTINGS_FILE = "rumble_settings.pkl"
+UA_FILE = "rumble_ua.txt"
+INVENTORY_FILE = "rumble_inventory.db"
+CHECKPOINT_FILE = "rumble_checkpoint.db"
+BLOCKLIST_FILE = "rumble_blocklist.txt"
+PLAN_DIR = "plans"
+DRIVER_DIR = "drivers"
+LOG_DIR = "logs"
+
+# --- SWARM ---
+LAUNCH_CONCURRENCY = 4  # browsers allowed to start at the same time
+INVENTORY_MAX_AGE = 30 * 86400  # inventory state older than this is re-read from the site
+WATERMARK_SIZE = 5  # newest video ids remembered per run (survives a few deletions)
+FALLBACK_PAGES = 150  # pages queued when the page count could not be discovered
+WAIT_CEILING = 10  # default upper bound (s) for any single wait in the edit flow
+ADAPTIVE_START = 2  # workers an adaptive run starts with
+CONTROL_INTERVAL = 5  # seconds between adaptive concurrency decisions
+BREAKER_DECREASE = 0.5  # editors kept when the circuit breaker trips
+LOCATE_OFFSETS = (1, 2, 3, -1)  # pages searched around a video's expected page (uploads push videos later)
+TABS_PER_BROWSER = 10  # "Tabs" mode: worker tabs sharing one browser process
+SESSION_WARN = 3600  # warn when the saved login expires within this many seconds
+# A resumed run keeps the shape of the interrupted one; worker count, browser
+# and waits come from the current settings.
+# "plan" is the plan an apply run executes, "plan_out" the file a dry run writes.
+RESUME_KEYS = ("dry", "start_page", "scan_mode", "edit_mode", "skip_verified", "incremental", "plan", "plan_out")
+
+DEFAULT_SETTINGS = {
+    "browser": "Auto-Detect",
+    "manual_path": "",
+    "threads": 4,
+    "scan_threads": 2,
+    "recycle_mb": RECYCLE_MB,
+    "recycle_pages": RECYCLE_PAGES,
+    "memory_budget_mb": 0,
+    "dry": True,
+    "head": True,
+    "start_page": "2",
+    "scan_mode": "Browser",
+    "edit_mode": "Direct",
+    "skip_verified": True,
+    "incremental": False,
+    "adaptive": False,
+    "wait_ceiling": str(WAIT_CEILING),
+    "browser_mode": "Processes",
+    "block_profile": "Safe",
+    "browser_versions": {}  # browser binary ("" = default Chrome) -> major version its driver needs
+}
+
+
+# --- SETTINGS / RULES FILES ---
+def load_settings():
+    settings = dict(DEFAULT_SETTINGS)
+    if os.path.exists(SETTINGS_FILE):
+        try:
+            settings.update(pickle.load(open(SETTINGS_FILE, "rb")))
+        except:
+            pass
+    return settings
+
+
+def save_settings(settings):
+    # Merged into the saved file, so keys the caller does not know about survive
+    try:
+        merged = load_settings()
+        merged.update(settings)
+        pickle.dump(merged, open(SETTINGS_FILE, "wb"))
+    except:
+        pass
+
+
+def load_rules():
+    if os.path.exists(RULES_FILE):
+        try:
+            return pickle.load(open(RULES_FILE, "rb"))
+        except:
+            pass
+    return []
+
+
+def load_user_agent():
+    if os.path.exists(UA_FILE):
+        try:
+            with open(UA_FILE) as f:
+                return f.read().strip()
+        except:
+            pass
+    return ""
+
+
+# --- BROWSER DETECTION HELPER ---
+def find_browsers():
+    found = {"Auto-Detect": ""}
+    prog_files = os.environ.get("PROGRAMFILES", "C:\\Program Files")
+    prog_files_x86 = os.environ.get("PROGRAMFILES(X86)", "C:\\Program Files (x86)")
+    local_app_data = os.environ.get("LOCALAPPDATA", "C:\\Users\\Default\\AppData\\Local")
+
+    candidates = {
+        "Google Chrome": [
+            os.path.join(prog_files, "Google\\Chrome\\Application\\chrome.exe"),
+            os.path.join(prog_files_x86, "Google\\Chrome\\Application\\chrome.exe")
+        ],
+        "Brave Browser": [
+            os.path.join(prog_files, "BraveSoftware\\Brave-Browser\\Application\\brave.exe"),
+            os.path.join(prog_files_x86, "BraveSoftware\\Brave-Browser\\Application\\brave.exe"),
+            os.path.join(local_app_data, "BraveSoftware\\Brave-Browser\\Application\\brave.exe")
+        ],
+        "Vivaldi": [
+            os.path.join(local_app_data, "Vivaldi\\Application\\vivaldi.exe")
+        ],
+        "Opera": [
+            os.path.join(local_app_data, "Programs\\Opera\\launcher.exe"),
+            os.path.join(prog_files, "Opera\\launcher.exe")
+        ],
+        "Opera GX": [
+            os.path.join(local_app_data, "Programs\\Opera GX\\launcher.exe")
+        ]
+    }
+
+    for name, paths in candidates.items():
+        for path in paths:
+            if os.path.exists(path):
+                found[name] = path
+                break
+    return found
+
+
+def browser_binary(settings, detected=None):
+    # Manual path wins, then the chosen detected browser, else uc's default
+    manual = settings.get("manual_path", "")
+    if manual and os.path.exists(manual):
+        return manual
+    detected = find_browsers() if detected is None else detected
+    return detected.get(settings.get("browser", "Auto-Detect"), "")
+
+
+class SwarmEngine:
+    def __init__(self, on_done=None):
+        # on_done() is called from a worker thread once a run has finished
+        self.on_done = on_done
+        self.is_running = False  # cleared by stop(); workers wind down when they see it
+        self.run_active = False  # set by start(), cleared only once the last worker is gone
+        self.completed = False  # last run reached its end (not stopped, no video left queued or failed)
+        self.matcher = RuleMatcher([])
+        self.page_queue = queue.Queue()
+        self.video_queue = VideoQueue()
+        self.page_pending = {}  # page -> [videos without outcome, all succeeded]
+        self.locator = None  # HttpScanner for videos that moved off their page, made on first use
+        self.located_pages = {}  # page -> rows fetched by the locator this run
+        self.locate_lock = threading.Lock()
+        self.edit_mode = "Modal"
+        self.direct_editors = {}
+        self.inventory = VideoInventory(INVENTORY_FILE)
+        self.checkpoint = RunCheckpoint(CHECKPOINT_FILE)
+        self.resume_pages = set()
+        self.resume_outcomes = {}
+        self.plan = None  # dry run: the plan being built
+        self.plan_path = ""
+        self.apply_plan = None  # apply run: the plan being executed
+        self.skip_verified = True
+        self.incremental = False
+        self.dry_run = True
+        self.headless = True
+        self.num_workers = 4  # editors
+        self.scan_workers = 2  # browser scanners
+        self.adaptive = False
+        self.controller = None
+        self.control_started = False
+        self.breaker = CircuitBreaker()
+        self.retry = RetryPolicy(self.breaker)
+        self.breaker_cap = None  # editor limit after a trip (non-adaptive runs)
+        self.binary_path = ""
+        self.browser_mode = "Processes"
+        self.hosts = []  # "Tabs" mode: shared browsers, [{"driver", "headless", "tabs", "retiring"}]
+        self.hosts_lock = threading.Lock()
+        self.block_patterns = []
+        self.net_stats = NetworkStats()
+        self.user_agent = ""
+        self.wait_ceiling = WAIT_CEILING
+        self.watermark = set()
+        self.watermark_page = None
+        self.run_newest = []
+        self.run_errors = 0
+        self.failed_videos = 0  # queued videos that never reached an outcome (edit error, not found)
+        self.counts = Counter()
+        self.session_expires = None
+        self.session_failed = False
+        self.start_pg = 1
+        self.last_pg = None
+        self.empty_page = None
+        self.active_workers = 0  # worker threads still running (scanners and editors)
+        self.active_scanners = 0
+        self.worker_slots = 0  # editors not asked to retire
+        self.next_worker_id = 1
+        self.stop_requested = False
+        self.governor = ResourceGovernor()
+        self.pool = DriverPool(self._launch_driver, LAUNCH_CONCURRENCY, self._driver_cap, self.governor.forget)
+        self.driver_path = None
+        self.driver_version = None
+        self.driver_path_lock = threading.Lock()
+        self.drivers = DriverStore(DRIVER_DIR)
+        self.browser_versions = {}
+        self.threads = []
+        self.run_log = RunLog(LOG_DIR)
+        self.metrics = RunMetrics()
+        self.state_lock = threading.Lock()
+        self.run_started = 0
+        self.swarm_started = 0
+        self.first_page_at = None
+
+    def log(self, message, worker=None, page=None, video=None, action=None):
+        # Safe from any thread; the front end decides how records are shown
+        if action:
+            with self.state_lock:
+                self.counts[action] += 1
+        self.run_log.emit(message, worker=worker, page=page, video=video, action=action)
+
+    def count(self, key):
+        with self.state_lock:
+            self.counts[key] += 1
+
+    def check_tags(self, rule, current_tags):
+        # Called for every video found already correct
+        if rule and tag_save_avoided(rule, current_tags): self.count("save_avoided")
+
+    # --- RUN CONTROL ---
+    def start(self, rules, settings, resume=False, plan_path=None):
+        # settings uses the same keys as the settings file (see DEFAULT_SETTINGS).
+        # resume=True continues the last unfinished run instead of starting over;
+        # plan_path applies a plan written by an earlier dry run.
+        with self.state_lock:
+            # A stopped run still owns its workers, queues and counters until it has wound down
+            if self.run_active: return None
+            self.run_active = True
+        run_log_path = self.run_log.start_run()
+        self.log(f"Run log: {run_log_path}")
+        settings = dict(settings, plan=plan_path or "", plan_out="")
+        last = self.last_run() if resume else None
+        if resume and not last:
+            self.log("No interrupted run to resume. Starting a new run.")
+        if last:
+            settings.update((k, last["settings"][k]) for k in RESUME_KEYS if k in last["settings"])
+            self.resume_pages = last["pages"]
+            self.resume_outcomes = last["outcomes"]
+            self.log(f"Resuming run from {time.strftime('%Y-%m-%d %H:%M', time.localtime(last['started']))}: "
+                     f"{len(self.resume_pages)} pages and {len(self.resume_outcomes)} videos already done.")
+        else:
+            self.resume_pages = set()
+            self.resume_outcomes = {}
+            if settings["plan"]:
+                settings["dry"] = False
+            elif settings["dry"]:
+                settings["plan_out"] = os.path.join(PLAN_DIR, time.strftime("plan_%Y%m%d_%H%M%S.json"))
+        if not self._load_plans(settings["plan"], settings["plan_out"]):
+            self.run_log.end_run()
+            self.run_active = False
+            return None
+        if not last: self.checkpoint.begin({k: settings[k] for k in RESUME_KEYS})
+        self.metrics.reset()
+        self.matcher = RuleMatcher(rules)
+        self.edit_mode = settings["edit_mode"]
+        self.skip_verified = settings["skip_verified"]
+        self.incremental = settings["incremental"]
+        self.dry_run = settings["dry"]
+        self.headless = settings["head"]
+        self.num_workers = max(1, int(settings["threads"]))
+        try:
+            self.scan_workers = max(1, int(settings["scan_threads"]))
+        except:
+            self.scan_workers = DEFAULT_SETTINGS["scan_threads"]
+        try:
+            self.governor.configure(float(settings["recycle_mb"]), int(settings["recycle_pages"]),
+                                    float(settings["memory_budget_mb"]))
+        except:
+            self.governor.configure()
+        self.adaptive = settings["adaptive"]
+        self.controller = None
+        binary_path = browser_binary(settings)
+        if binary_path != self.binary_path: self.driver_path = None
+        self.binary_path = binary_path
+        self.browser_versions = dict(load_settings()["browser_versions"])
+        self.browser_mode = settings["browser_mode"]
+        extra_types, extra_patterns = load_blocklist(BLOCKLIST_FILE)
+        self.block_patterns = block_patterns(settings["block_profile"], extra_types, extra_patterns)
+        self.net_stats.reset()
+        self.user_agent = load_user_agent()
+        try:
+            self.wait_ceiling = max(1.0, float(settings["wait_ceiling"]))
+        except:
+            self.wait_ceiling = WAIT_CEILING
+        self.watermark = set(self.inventory.get_meta("watermark", [])) if self.incremental else set()
+        self.watermark_page = None
+        self.empty_page = None
+        self.run_newest = []
+        self.run_errors = 0
+        self.failed_videos = 0
+        self.counts = Counter()
+        self.session_expires = None
+        self.session_failed = False
+        self.stop_requested = False
+        self.completed = False
+        self.is_running = True
+        self.run_started = time.time()
+
+        # Get Start Page
+        try:
+            start_pg = int(settings["start_page"])
+            if start_pg < 1: start_pg = 1
+        except:
+            start_pg = 1
+        self.start_pg = start_pg
+
+        if self.watermark:
+            self.log("Incremental: scanning until last run's newest videos.")
+        if self.block_patterns:
+            self.log(f"Network blocking ({settings['block_profile']}): {len(self.block_patterns)} URL patterns.")
+
+        with self.page_queue.mutex:
+            self.page_queue.queue.clear()
+
+        threading.Thread(target=self.launch_swarm, args=(start_pg, settings["scan_mode"]), daemon=True).start()
+        return run_log_path
+
+    def _load_plans(self, plan_path, plan_out):
+        # Apply runs read their plan; dry runs start (or, when resumed, continue) one
+        self.apply_plan, self.plan, self.plan_path = None, None, plan_out
+        try:
+            if plan_path:
+                self.apply_plan = ChangePlan.load(plan_path)
+                self.log(f"Applying plan {plan_path}: {len(self.apply_plan)} changes.")
+            elif plan_out:
+                self.plan = ChangePlan.load(plan_out) if os.path.exists(plan_out) else ChangePlan()
+        except (OSError, ValueError, KeyError) as e:
+            self.log(f"Could not read plan {plan_path or plan_out}: {e}")
+            return False
+        return True
+
+    def save_plan(self):
+        # Called when a dry run ends (or the app closes mid-run); diffed against the previous plan
+        if self.plan is None or not self.plan_path: return
+        try:
+            self.plan.save(self.plan_path)
+        except OSError as e:
+            self.log(f"Could not write plan: {e}")
+            return
+        self.log(f"Plan: {len(self.plan)} changes written to {self.plan_path}"
+                 f"{'' if self.plan.complete else ' (run did not finish)'}.")
+        previous = latest_plan(PLAN_DIR, exclude=self.plan_path)
+        if previous:
+            try:
+                added, removed, changed = diff_plans(ChangePlan.load(previous), self.plan)
+                self.log(f"Plan vs {os.path.basename(previous)}: {len(added)} added, {len(removed)} removed, "
+                         f"{len(changed)} changed.")
+            except (OSError, ValueError, KeyError):
+                pass
+
+    def stop(self):
+        self.stop_requested = True
+        self.is_running = False
+        self.log("Stopping swarm...")
+
+    def close(self):
+        if self.is_running: self.save_plan()
+        self.is_running = False
+        for editor in self.direct_editors.values():
+            editor.close()
+        self.pool.close_all()
+        with self.hosts_lock:
+            hosts, self.hosts = self.hosts, []
+        for host in hosts:
+            try:
+                host["driver"].quit()
+            except Exception:
+                pass
+        self.inventory.close()
+        self.checkpoint.close()
+        self.run_log.end_run()
+
+    def summary(self):
+        with self.state_lock:
+            counts = dict(self.counts)
+        return {"completed": self.completed, "stopped": self.stop_requested, "elapsed": time.time() - self.run_started,
+                "pages": counts.get("page", 0), "matches": counts.get("match", 0),
+                "verified": counts.get("verified", 0), "updates": counts.get("update", 0),
+                "saved": counts.get("saved", 0), "correct": counts.get("correct", 0),
+                "resumed": counts.get("resumed", 0), "planned": counts.get("planned", 0),
+                "stale": counts.get("stale", 0), "saves_avoided": counts.get("save_avoided", 0),
+                "retries": counts.get("retry", 0), "breaker_trips": counts.get("breaker_open", 0),
+                "recycled": counts.get("recycle", 0), "moved": counts.get("moved", 0),
+                "not_found": counts.get("not_found", 0),
+                "errors": self.run_errors + counts.get("edit_error", 0)}
+
+    def _session_expired(self, e, tag=""):
+        self.log(f"{tag}{e} Please log in again.")
+        self.stop()
+        self.video_queue.close()
+        with self.state_lock:
+            idle = self.active_workers == 0
+        if idle: self._on_swarm_done()
+
+    def launch_swarm(self, start_pg, scan_mode):
+        try:
+            self._check_session()
+            if self.apply_plan is not None:
+                self._queue_plan()
+                return
+            self.last_pg = self._discover_pages(start_pg)
+        except SessionExpiredError as e:
+            self._session_expired(e)
+            return
+        except Exception as e:
+            # No worker has started yet, so nobody else would end the run
+            self.log(f"Could not start the swarm: {e}")
+            self.stop()
+            self._on_swarm_done()
+            return
+
+        if self.last_pg is not None and self.last_pg < start_pg:
+            self.log(f"Page {start_pg} has no videos. Nothing to do.")
+            self._on_swarm_done()
+            return
+        self.checkpoint.set_last_page(self.last_pg)
+
+        if scan_mode == "HTTP":
+            self.http_swarm(start_pg)
+            return
+
+        # Queue exactly the discovered pages (or a fixed window if discovery failed)
+        end_pg = self.last_pg if self.last_pg is not None else start_pg + FALLBACK_PAGES - 1
+        for i in range(start_pg, end_pg + 1):
+            if i not in self.resume_pages: self.page_queue.put(i)
+
+        if self.page_queue.empty():
+            self.log("Every page was already done before the interruption.")
+            self._on_swarm_done()
+            return
+        self._begin_swarm()
+        self.start_scanners()
+
+    def _queue_plan(self):
+        # Apply stage: no discovery or scanning, only the planned videos
+        self._begin_swarm()
+        self._add_scanner()
+        for page_num, entries in self.apply_plan.by_page().items():
+            if page_num in self.resume_pages: continue
+            rows = [dict(e, plan=e) for e in entries if e["video_id"] not in self.resume_outcomes]
+            if rows: self.enqueue_videos(page_num, rows)
+        if not self.video_queue.total: self.log("Nothing left to apply in this plan.")
+        self._scanner_finished()
+
+    # --- SESSION ---
+    def _check_session(self):
+        # Validated once before any browser starts; an expired or rejected login
+        # raises SessionExpiredError, a network problem is only logged.
+        scanner = HttpScanner(COOKIES_FILE, self.user_agent, concurrency=1)
+        try:
+            self.session_expires = scanner.check_session()
+        except SessionExpiredError:
+            raise
+        except Exception as e:
+            self.log(f"Could not check the session ({str(e).splitlines()[0]}). Continuing.")
+            return
+        finally:
+            scanner.close()
+        if self.session_expires is None:
+            self.log("Session OK.")
+            return
+        left = self.session_expires - time.time()
+        expires = time.strftime("%Y-%m-%d %H:%M", time.localtime(self.session_expires))
+        self.log(f"Session OK, login expires {expires}.")
+        if left < SESSION_WARN:
+            self.log(f"Warning: the login expires in {left / 60:.0f} min. Log in again for a long run.")
+
+    def session_ok(self):
+        # Checked by workers before every page
+        if self.session_failed: return False
+        if self.session_expires is not None and time.time() > self.session_expires:
+            self.session_lost("Saved login expired during the run.")
+            return False
+        return True
+
+    def session_lost(self, reason):
+        # First report wins; every worker stops at its next page
+        with self.state_lock:
+            if self.session_failed: return
+            self.session_failed = True
+        self.run_errors += 1
+        self.log(f"{reason} Session is no longer valid, stopping all workers. Please log in again.",
+                 action="session_expired")
+        self.stop()
+
+    def _discover_pages(self, start_pg):
+        # Cheap HTTP probes using the saved session; None means "unknown"
+        scanner = HttpScanner(COOKIES_FILE, self.user_agent, concurrency=1)
+        started = time.time()
+        try:
+            last_pg = scanner.page_count(start_pg)
+        except SessionExpiredError:
+            raise
+        except Exception as e:
+            self.log(f"Page discovery failed ({str(e).splitlines()[0]}). Scanning up to {FALLBACK_PAGES} pages.")
+            return None
+        finally:
+            scanner.close()
+        if last_pg >= start_pg:
+            self.log(f"Discovered {last_pg - start_pg + 1} pages ({start_pg}-{last_pg}) in {time.time() - started:.1f}s.")
+        return last_pg
+
+    # --- BROWSER WORKERS ---
+    def _pool_key(self):
+        return self.headless, self.browser_mode
+
+    def _driver_cap(self, key):
+        return self.governor.driver_cap(key[1] == "Tabs")
+
+    def recycle_driver(self, worker, reason):
+        # The worker's driver is quit and a fresh one (cookies loaded on launch)
+        # takes over; the worker is between two tasks, so nothing is lost
+        from rumble_browser import apply_blocklist
+        old, worker.driver = worker.driver, None
+        self.pool.discard(old)
+        try:
+            driver, warm = self.pool.acquire(self._pool_key(), lambda: self.is_running)
+        except Exception as e:
+            self.log(f"[RG] W{worker.worker_id} could not relaunch its browser: {e}", worker.worker_id)
+            self.run_errors += 1
+            return False
+        if driver is None: return False
+        try:
+            apply_blocklist(driver, self.block_patterns)
+        except Exception:
+            pass
+        worker.driver = driver
+        self.governor.recycled += 1
+        self.log(f"[RG] W{worker.worker_id} browser recycled ({reason}).", worker.worker_id, action="recycle")
+        return True
+
+    def _launch_driver(self, key):
+        headless, mode = key
+        if mode == "Tabs": return self._launch_tab(headless)
+        return self._launch_browser(headless)
+
+    # --- DRIVER BINARY ---
+    # Every launch uses a patched chromedriver from the driver store, resolved
+    # once per browser under driver_path_lock: the remembered browser version
+    # (or a detected one) picks the binary, and a mismatch reported by the
+    # driver swaps it once for all workers and is remembered in the settings.
+    def _resolve_driver(self, version=None):
+        if version is None:
+            version = self.browser_versions.get(self.binary_path) or browser_version(self.binary_path)
+        try:
+            self.driver_path, self.driver_version = self.drivers.resolve(version, self.log)
+        except Exception as e:
+            # Without the store every launch lets uc fetch and patch its own driver
+            self.log(f"Drivers: could not prepare chromedriver {version or '(latest)'} ({e}); "
+                     f"falling back to undetected_chromedriver's own download.")
+            self.driver_path, self.driver_version = "", None
+            return
+        self.log(f"Drivers: chromedriver {self.driver_version} for "
+                 f"{os.path.basename(self.binary_path) or 'default Chrome'}.")
+
+    def _driver_for(self, failed_version=None):
+        # The store path for launches; failed_version: the browser version a launch reported
+        with self.driver_path_lock:
+            if failed_version is not None and failed_version != self.driver_version:
+                self._resolve_driver(failed_version)
+            elif self.driver_path is None:
+                self._resolve_driver()
+            return self.driver_path
+
+    def _remember_version(self):
+        if not self.driver_version or self.browser_versions.get(self.binary_path) == self.driver_version: return
+        self.browser_versions = dict(self.browser_versions, **{self.binary_path: self.driver_version})
+        save_settings({"browser_versions": self.browser_versions})
+
+    def _launch_browser(self, headless, tabs=False):
+        from rumble_browser import get_driver, load_cookies
+        try:
+            d = get_driver(headless, self.binary_path, driver_path=self._driver_for(), log=self.log, tabs=tabs,
+                           perf_log=True)
+        except DriverVersionError as e:
+            d = get_driver(headless, self.binary_path, driver_path=self._driver_for(e.version), log=self.log,
+                           tabs=tabs, perf_log=True)
+        with self.driver_path_lock:
+            self._remember_version()
+        load_cookies(d, COOKIES_FILE)
+        return d
+
+    def _launch_tab(self, headless):
+        # A worker tab in a shared browser; a new browser is only started once
+        # every running one holds TABS_PER_BROWSER tabs. Tabs share the browser's
+        # cookies, which were loaded when it started.
+        from rumble_browser import attach_tab
+        with self.hosts_lock:
+            self.hosts = [h for h in self.hosts if DriverPool.is_healthy(h["driver"])]
+            host = next((h for h in self.hosts if h["headless"] == headless and h["tabs"] < TABS_PER_BROWSER
+                         and not h["retiring"]), None)
+            if host is None:
+                host = {"driver": self._launch_browser(headless, tabs=True), "headless": headless, "tabs": 0,
+                        "retiring": False}
+                self.hosts.append(host)
+                self.log(f"Tabs: shared browser {len(self.hosts)} started.")
+            host["tabs"] += 1
+        try:
+            tab = attach_tab(host["driver"], self.driver_path, headless, on_quit=lambda: self._tab_closed(host),
+                             perf_log=True)
+        except Exception:
+            self._tab_closed(host)
+            raise
+        tab.host = host
+        return tab
+
+    def _tab_closed(self, host):
+        # A host the governor retired is quit once its last tab is gone
+        with self.hosts_lock:
+            host["tabs"] -= 1
+            done = host["retiring"] and host["tabs"] <= 0 and host in self.hosts
+            if done: self.hosts.remove(host)
+        if not done: return
+        try:
+            host["driver"].quit()
+        except Exception:
+            pass
+        self.governor.recycled += 1
+        self.log("[RG] Shared browser recycled (all its tabs moved).", action="recycle")
+
+    def _release(self, driver):
+        # Tabs of a retiring host are closed instead of kept idle, so the host can go
+        host = getattr(driver, "host", None)
+        if host and host["retiring"]:
+            self.pool.discard(driver)
+        else:
+            self.pool.release(driver, self._pool_key())
+
+    # --- SCAN / EDIT STAGES ---
+    # Scanners load listing pages and queue every matched video; editors take
+    # single videos from the queue. Each worker launches (or borrows) its own
+    # browser and starts as soon as that browser is ready. The run ends when
+    # the last worker of either stage is gone.
+    def _begin_swarm(self):
+        self.swarm_started = time.time()
+        self.first_page_at = None
+        self.threads = []
+        self.next_worker_id = 1
+        self.active_workers = 0
+        self.active_scanners = 0
+        self.worker_slots = 0
+        self.page_pending = {}
+        self.video_queue = VideoQueue()
+        self.controller = None
+        self.control_started = False
+        self.breaker = CircuitBreaker(self._breaker_tripped, self._breaker_resumed)
+        self.retry = RetryPolicy(self.breaker)
+        self.breaker_cap = None
+        self.locator = None
+        self.located_pages = {}
+        if self.adaptive:
+            self.controller = ConcurrencyController(1, self.num_workers, min(self.num_workers, ADAPTIVE_START))
+            self.log(f"Adaptive concurrency: starting with {self.controller.target} of up to {self.num_workers} "
+                     f"editors.")
+        self.governor.peak_mb = 0
+        self.governor.recycled = 0
+        cap = self._driver_cap(self._pool_key())
+        if cap is not None:
+            self.log(f"[RG] Memory budget {self.governor.budget_mb:.0f} MB: up to {cap} browsers at once "
+                     f"(~{self.governor.driver_mb(self.browser_mode == 'Tabs'):.0f} MB each).")
+
+    def start_scanners(self):
+        count = min(self.scan_workers, self.page_queue.qsize())
+        self.log(f"Initializing {count} scanners, up to {self.num_workers} editors...")
+        for i in range(count):
+            self._add_scanner()
+            self._start_worker_thread("scan")
+        self.log("Swarm active.")
+
+    def enqueue_videos(self, page_num, rows):
+        # A scanned page's matches; the page counts as done once each has an outcome
+        if not rows:
+            self.page_done(page_num)
+            return
+        with self.state_lock:
+            self.page_pending[page_num] = [len(rows), True]
+        self.video_queue.put(page_num, rows)
+        self._grow_editors()
+
+    def video_finished(self, row, ok):
+        with self.state_lock:
+            if not ok: self.failed_videos += 1
+            pending = self.page_pending.get(row.get("page"))
+            if not pending: return
+            pending[0] -= 1
+            pending[1] = pending[1] and ok
+            complete = pending[0] == 0 and pending[1]
+        if complete and self.is_running: self.page_done(row["page"])
+
+    def _grow_editors(self, revive=True):
+        # Editors start as videos arrive: never more than the editor limit (the
+        # adaptive target) nor than the videos queued so far this run.
+        while self.is_running:
+            limit = self.editor_limit()
+            with self.state_lock:
+                # The control loop must never revive a swarm whose last worker already finished
+                if not revive and not self.active_workers: break
+                if self.worker_slots >= min(limit, self.video_queue.total): break
+                self.active_workers += 1
+                self.worker_slots += 1
+                start_control = self.controller and not self.control_started
+                self.control_started = self.control_started or bool(start_control)
+            self._start_worker_thread("edit")
+            if start_control: threading.Thread(target=self._control_loop, daemon=True).start()
+
+    def _add_scanner(self):
+        # The HTTP scan and the plan loader count as scanners too, so editors
+        # that finish early never end the run while videos may still arrive
+        with self.state_lock:
+            self.active_workers += 1
+            self.active_scanners += 1
+
+    def _scanner_finished(self):
+        with self.state_lock:
+            self.active_workers -= 1
+            self.active_scanners -= 1
+            scanned = self.active_scanners == 0
+            last = self.active_workers == 0
+        # No scanner left means no more videos will arrive
+        if scanned: self.video_queue.close()
+        if last: self._on_swarm_done()
+
+    def _start_worker_thread(self, role):
+        # Callers have already counted the thread in active_workers
+        with self.state_lock:
+            worker_id = self.next_worker_id
+            self.next_worker_id += 1
+        t = threading.Thread(target=self.run_worker, args=(worker_id, role), daemon=True)
+        self.threads.append(t)
+        t.start()
+
+    def run_worker(self, worker_id, role):
+        retired = False
+        try:
+            if not self.is_running: return
+            if self.page_queue.empty() if role == "scan" else self.video_queue.done(): return
+            try:
+                from rumble_browser import BrowserWorker, apply_blocklist
+                driver, warm = self.pool.acquire(self._pool_key(), lambda: self.is_running)
+            except Exception as e:
+                self.log(f"  Worker {worker_id} Failed: {e}")
+                self.run_errors += 1
+                return
+            if driver is None: return
+
+            self.log(f"  Worker {worker_id} Ready ({'scanner' if role == 'scan' else 'editor'}"
+                     f"{', warm' if warm else ''}).")
+            worker = None
+            try:
+                try:
+                    # Per run, so warm drivers pick up a changed profile
+                    apply_blocklist(driver, self.block_patterns)
+                except Exception as e:
+                    self.log(f"  Worker {worker_id}: network blocking unavailable ({str(e).splitlines()[0]}).")
+                worker = BrowserWorker(self, worker_id, driver)
+                if role == "scan":
+                    worker.scan_task(self.dry_run)
+                else:
+                    worker.edit_task(self.dry_run)
+                retired = worker.retired
+            finally:
+                # The worker's driver is replaced when recycled, None if that failed
+                if worker: driver = worker.driver
+                if driver is not None: self._release(driver)
+        finally:
+            if role == "scan":
+                self._scanner_finished()
+            else:
+                with self.state_lock:
+                    self.active_workers -= 1
+                    if not retired: self.worker_slots -= 1
+                    last = self.active_workers == 0
+                if last: self._on_swarm_done()
+
+    # --- MOVED VIDEOS ---
+    def locate_video(self, row):
+        # A video missing from the page it was scanned or planned on has usually
+        # moved: uploads since then push it to a later page, deletions to an
+        # earlier one. Looks it up by id on the pages around; (page, position) or None.
+        vid, page = row.get("video_id"), row.get("page")
+        if not vid or not page: return None
+        for pg in (page + d for d in LOCATE_OFFSETS):
+            if pg < 1 or not self.is_running: continue
+            for r in self._listing_rows(pg):
+                if r["video_id"] == vid: return pg, r["position"]
+        return None
+
+    def _listing_rows(self, page):
+        # Fetched once per run over HTTP and shared by every editor
+        with self.locate_lock:
+            if page in self.located_pages: return self.located_pages[page]
+            if self.locator is None:
+                self.locator = HttpScanner(COOKIES_FILE, self.user_agent, concurrency=1)
+            try:
+                rows = self.retry.call(lambda: self.locator.fetch_listing(page), lambda: self.is_running)
+            except SessionExpiredError as e:
+                self.session_lost(f"[S] {e}")
+                return []
+            except Exception as e:
+                self.log(f"[S] Could not fetch page {page} to locate a video: {str(e).splitlines()[0]}")
+                return []
+            self.located_pages[page] = rows
+            return rows
+
+    # --- ADAPTIVE CONCURRENCY ---
+    def page_result(self, seconds, ok=True):
+        # Called by editors once per video with the time its edit form took to
+        # open: every video opens one whatever its outcome (saved, correct,
+        # planned), so unlike the whole video's duration the samples compare
+        if self.controller: self.controller.record(seconds, ok)
+
+    def should_retire(self):
+        # An editor asks between videos; surplus editors hand their browser back
+        # to the pool (kept warm in case the swarm grows again) and exit.
+        limit = self.editor_limit()
+        with self.state_lock:
+            if self.worker_slots > limit:
+                self.worker_slots -= 1
+                return True
+        return False
+
+    def editor_limit(self):
+        limit = self.controller.target if self.controller else self.num_workers
+        return min(limit, self.breaker_cap) if self.breaker_cap else limit
+
+    # --- CIRCUIT BREAKER ---
+    # Every worker attempt (page load, modal open, edit) is reported to the
+    # breaker; when most of the recent ones fail, every worker waits out the
+    # cool-down and fewer editors carry on (adaptive runs may grow again).
+    def _breaker_tripped(self, rate, failures, cooldown):
+        old = self.editor_limit()
+        new = max(1, int(old * BREAKER_DECREASE))
+        if self.controller:
+            self.controller.target = min(self.controller.target, new)
+        else:
+            self.breaker_cap = new
+        kinds = ", ".join(f"{k} {n}" for k, n in sorted(failures.items(), key=lambda kv: -kv[1]))
+        self.log(f"[CB] {rate:.0%} of recent attempts failed ({kinds}): pausing all workers for {cooldown:.0f}s, "
+                 f"editors {old} -> {new}.", "CB", action="breaker_open")
+
+    def _breaker_resumed(self):
+        self.log(f"[CB] Cool-down over, resuming with {self.editor_limit()} editors.", "CB", action="breaker_closed")
+
+    def _control_loop(self):
+        controller = self.controller
+        while self.is_running and self.active_workers:
+            time.sleep(CONTROL_INTERVAL)
+            if not self.is_running or controller is not self.controller: return
+            old = controller.target
+            has_work = self.video_queue.qsize() > 0
+            target, reason = controller.decide(has_work=has_work)
+            if target != old:
+                self.log(f"[AC] Concurrency {old} -> {target}: {reason}", "AC", action="concurrency")
+            if has_work: self._grow_editors(revive=False)
+
+    # --- CHECKPOINT ---
+    def last_run(self):
+        # The last run's checkpoint if it never finished, else None
+        last = self.checkpoint.load()
+        return last if last and last["finished"] is None else None
+
+    def page_done(self, page_num):
+        # Only pages whose every match reached an outcome; the rest are requeued on resume
+        self.checkpoint.page_done(page_num)
+
+    def video_done(self, row, outcome):
+        self.checkpoint.video_outcome(row["video_id"], row.get("page"), outcome)
+
+    def plan_change(self, row, rule, category, current_chan, current_tags, new_chan, new_tags):
+        if self.plan is not None:
+            self.plan.add(plan_entry(row, rule, category, current_chan, current_tags, new_chan, new_tags))
+        self.video_done(row, "planned")
+
+    def _on_swarm_done(self):
+        # Editors that all failed (no browser, lost login) can leave videos queued,
+        # and videos that failed keep their page out of page_done: either way the
+        # checkpoint stays open so Resume can finish them
+        left = self.video_queue.qsize()
+        completed = self.completed = not self.stop_requested and not left and not self.failed_videos
+        if left and not self.stop_requested:
+            self.log(f"{left} queued videos were never edited (no editor left). Resume to finish them.")
+        if self.failed_videos and not self.stop_requested:
+            self.log(f"{self.failed_videos} videos failed or were not found. Resume to retry their pages.")
+        if completed: self.checkpoint.finish()
+        if self.plan is not None:
+            self.plan.complete = completed
+            self.save_plan()
+        # Every page scanned and every queued video reached an outcome; otherwise
+        # the next run has to reach these videos again
+        failures = self.run_errors + self.failed_videos
+        if completed and self.incremental and self.run_newest and not failures and not self.dry_run:
+            self.inventory.set_meta("watermark", self.run_newest)
+            self.log(f"Incremental: watermark moved to {self.run_newest[0]}.")
+        elif self.incremental and failures:
+            self.log(f"Incremental: {self.run_errors} errors, {self.failed_videos} unfinished videos this run, "
+                     "watermark left unchanged.")
+        self.log("Swarm finished." if completed else "Swarm stopped." if self.stop_requested
+                 else "Swarm ended with unfinished videos.")
+        avoided = self.counts.get("save_avoided", 0)
+        if avoided: self.log(f"Saves avoided: {avoided} videos whose tags only differed in order, case or spacing.")
+        if self.adaptive and self.controller:
+            self.log(f"[AC] Final concurrency {self.controller.target} (peak {self.controller.peak}).")
+        self._report_metrics()
+        if self.locator is not None:
+            self.locator.close()
+            self.locator = None
+        self.is_running = False
+        self.run_active = False
+        if self.on_done: self.on_done()
+
+    def _report_metrics(self):
+        for line in self.net_stats.report_lines():
+            self.log(line)
+        if self.governor.peak_mb or self.governor.recycled:
+            peak = f", peak {self.governor.peak_mb:.0f} MB per browser" if self.governor.peak_mb else ""
+            self.log(f"Browsers: {self.governor.recycled} recycled{peak}.")
+        summary = self.metrics.summary()
+        for line in self.metrics.report_lines(summary):
+            self.log(line)
+        if summary["phases"] and self.run_log.path:
+            try:
+                json_path, csv_path = self.metrics.export(self.run_log.path[:-len(".jsonl")] + "_perf", summary)
+                self.log(f"Performance report: {json_path}, {csv_path}")
+            except OSError as e:
+                self.log(f"Could not export performance report: {e}")
+
+    # --- SCAN STATE ---
+    def _apply_watermark(self, page_num, rows):
+        # Remember the newest ids of this run, and cut the listing at the first
+        # video the previous incremental run had already reached.
+        if page_num == self.start_pg:
+            self.run_newest = [r["video_id"] for r in rows if r["video_id"]][:WATERMARK_SIZE]
+        if not self.watermark: return rows
+        for i, row in enumerate(rows):
+            if row["video_id"] in self.watermark:
+                with self.state_lock:
+                    if self.watermark_page is None or page_num < self.watermark_page:
+                        self.watermark_page = page_num
+                self.log(f"Incremental: reached last run's newest videos on page {page_num}.")
+                return rows[:i]
+        return rows
+
+    def _past_end(self, page_num):
+        # Past the incremental watermark, or past a page confirmed empty
+        if self.watermark_page is not None and page_num > self.watermark_page: return True
+        return self.empty_page is not None and page_num > self.empty_page
+
+    def _mark_first_page(self):
+        if self.first_page_at is not None: return
+        with self.state_lock:
+            if self.first_page_at is not None: return
+            self.first_page_at = time.time()
+        self.log(f"Time to first page: {self.first_page_at - self.swarm_started:.1f}s")
+
+    def match_rows(self, tag, rows, page_num):
+        to_process = []
+        for row in rows:
+            if not self.matcher.match(row["title"]): continue
+            if row["video_id"] in self.resume_outcomes:
+                self.log(f"[{tag}] [=] Done before interruption: {row['title'][:30]}...", tag, page_num,
+                         row["video_id"], "resumed")
+                continue
+            state = self._fresh_state(row) if self.skip_verified else None
+            if state:
+                # Known state: nothing to read, so no edit modal is opened
+                rule = self.matcher.match(row["title"], state["category"] or "")
+                new_chan, new_tags = plan_changes(rule, state["channel"], state["tags"]) if rule else (None, None)
+                if not new_chan and new_tags is None:
+                    self.check_tags(rule, state["tags"])
+                    self.log(f"[{tag}] [=] Verified from inventory: {row['title'][:30]}...", tag, page_num,
+                             row["video_id"], "verified")
+                    continue
+                if self.plan is not None:
+                    row["page"] = page_num
+                    self.plan_change(row, rule, state["category"], state["channel"], state["tags"], new_chan,
+                                     new_tags)
+                    self.log(f"[{tag}] [P] Planned from inventory: {row['title'][:30]}...", tag, page_num,
+                             row["video_id"], "planned")
+                    continue
+            self.log(f"[{tag}] [+] Match Found: {row['title'][:30]}...", tag, page_num, row["video_id"], "match")
+            row["page"] = page_num
+            to_process.append(row)
+        self.inventory.record_seen(rows, page_num)
+        return to_process
+
+    def _fresh_state(self, row):
+        # Stored state if it was read recently for the same title, else None
+        state = self.inventory.get(row["video_id"])
+        if not state or state["verified_at"] is None or state["title"] != row["title"]: return None
+        if time.time() - state["verified_at"] > INVENTORY_MAX_AGE: return None
+        return state
+
+    # --- HTTP SCAN MODE ---
+    def http_swarm(self, start_pg):
+        known = self.last_pg is not None
+        max_pages = self.last_pg - start_pg + 1 if known else FALLBACK_PAGES
+        self.log("HTTP scan: fetching listing pages without a browser...")
+        # Editors start on the first matches while the scan is still running
+        self._begin_swarm()
+        self._add_scanner()
+        scanner = HttpScanner(COOKIES_FILE, self.user_agent, concurrency=8, retry=self.retry)
+        started = time.time()
+
+        def on_page(page_num, rows):
+            if page_num in self.resume_pages: return True
+            all_rows = len(rows)
+            rows = self._apply_watermark(page_num, rows)
+            to_process = self.match_rows("S", rows, page_num)
+            self.log(f"[S] Page {page_num}: {len(rows)} videos, {len(to_process)} matches.", "S", page_num,
+                     action="page")
+            self.enqueue_videos(page_num, to_process)
+            return len(rows) == all_rows
+
+        def on_error(page_num, e):
+            self.log(f"[S] Error Pg {page_num}: {e}", "S", page_num, action="page_error")
+            self.run_errors += 1
+
+        try:
+            pages = scanner.scan(start_pg, max_pages, on_page, on_error,
+                                 should_continue=lambda: self.breaker.wait(lambda: self.is_running),
+                                 stop_on_empty=not known)
+        except SessionExpiredError as e:
+            self.log(f"[S] {e} Please log in again.")
+            self.stop()
+            pages = 0
+        finally:
+            scanner.close()
+
+        if self.is_running:
+            self.log(f"HTTP scan done: {pages} pages in {time.time() - started:.1f}s, "
+                     f"{self.video_queue.total} videos queued for editing.")
+        self._scanner_finished()
@@ -0,0 +1,113 @@
+# --- DRIVER RESOURCE GOVERNOR ---
+# Chrome's memory grows with every page load and modal, so a driver is
+# recycled (quit and relaunched with the saved cookies) once it has handled
+# RECYCLE_PAGES pages/videos or its processes use more than RECYCLE_MB of
+# RSS. Workers only recycle between two tasks, so nothing in flight is lost.
+# The memory budget caps how many drivers may exist on the host at once: the
+# cap is the budget divided by what a driver currently uses on average (an
+# estimate until the first measurements). In "Tabs" mode the memory that grows
+# is the shared host browser's: each tab is charged an equal share of its
+# host's RSS, and a host over the limit is retired (its tabs recycle onto
+# another browser and it is quit once the last one is gone). RSS needs psutil;
+# without it only the page limit applies.
+import threading
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+RECYCLE_MB = 1500  # per browser, chromedriver and renderers included
+RECYCLE_PAGES = 300  # pages/videos a driver handles before it is replaced
+BUDGET_SHARE = 0.6  # automatic budget: this share of the host's RAM
+RSS_CHECK_EVERY = 5  # tasks between RSS measurements (walking the process tree is not free)
+BROWSER_MB_ESTIMATE = 400  # a fresh browser, until real measurements exist
+TAB_MB_ESTIMATE = 150  # a worker tab in a shared browser
+
+
+def driver_rss(driver):
+    # Bytes used by the driver's browser and chromedriver process trees, None if
+    # unknown. Tabs share their browser's processes, so they have no RSS of their own.
+    if not psutil or getattr(driver, "shared_browser", False): return None
+    pids = [getattr(driver, "browser_pid", None)]
+    service = getattr(getattr(driver, "service", None), "process", None)
+    if service: pids.append(service.pid)
+    total, seen = 0, set()
+    for pid in pids:
+        if not pid: continue
+        try:
+            root = psutil.Process(pid)
+            procs = [root] + root.children(recursive=True)
+        except psutil.Error:
+            continue
+        for p in procs:
+            if p.pid in seen: continue
+            seen.add(p.pid)
+            try:
+                total += p.memory_info().rss
+            except psutil.Error:
+                pass
+    return total or None
+
+
+def host_memory_mb():
+    if not psutil: return None
+    return psutil.virtual_memory().total / 2 ** 20
+
+
+class ResourceGovernor:
+    def __init__(self, recycle_mb=RECYCLE_MB, recycle_pages=RECYCLE_PAGES, budget_mb=0):
+        self._lock = threading.Lock()
+        self._usage = {}  # id(driver) -> [tasks handled, last RSS in MB]
+        self.configure(recycle_mb, recycle_pages, budget_mb)
+        self.peak_mb = 0
+        self.recycled = 0
+
+    def configure(self, recycle_mb=RECYCLE_MB, recycle_pages=RECYCLE_PAGES, budget_mb=0):
+        # 0 disables a limit; budget_mb 0 means "automatic" (a share of the host's RAM)
+        self.recycle_mb = recycle_mb or 0
+        self.recycle_pages = recycle_pages or 0
+        if not budget_mb:
+            total = host_memory_mb()
+            budget_mb = total * BUDGET_SHARE if total else 0
+        self.budget_mb = budget_mb
+
+    def forget(self, driver):
+        with self._lock:
+            self._usage.pop(id(driver), None)
+
+    def task_done(self, driver):
+        # Called after each page/video; returns why the driver should be recycled, or None.
+        # A tab's driver.host is its shared browser: {"driver", "tabs", "retiring"}.
+        host = getattr(driver, "host", None)
+        if host and host.get("retiring"): return "shared browser recycled"
+        with self._lock:
+            usage = self._usage.setdefault(id(driver), [0, None])
+            usage[0] += 1
+            tasks = usage[0]
+        if self.recycle_pages and tasks >= self.recycle_pages:
+            return f"{tasks} pages handled"
+        if tasks % RSS_CHECK_EVERY: return None
+        rss = driver_rss(host["driver"] if host else driver)
+        if rss is None: return None
+        mb = rss / 2 ** 20
+        with self._lock:
+            usage[1] = mb / max(1, host["tabs"]) if host else mb
+            self.peak_mb = max(self.peak_mb, mb)
+        if self.recycle_mb and mb > self.recycle_mb:
+            if not host: return f"RSS {mb:.0f} MB > {self.recycle_mb:.0f} MB"
+            host["retiring"] = True
+            return f"shared browser RSS {mb:.0f} MB > {self.recycle_mb:.0f} MB"
+        return None
+
+    def driver_mb(self, tabs=False):
+        # Average measured MB per driver (a tab's share of its host in Tabs mode)
+        with self._lock:
+            measured = [u[1] for u in self._usage.values() if u[1]]
+        if measured: return sum(measured) / len(measured)
+        return TAB_MB_ESTIMATE if tabs else BROWSER_MB_ESTIMATE
+
+    def driver_cap(self, tabs=False):
+        # Drivers allowed at once under the memory budget (None: no budget)
+        if not self.budget_mb: return None
+        return max(1, int(self.budget_mb // self.driver_mb(tabs)))
@@ -0,0 +1,88 @@
+# --- VIDEO INVENTORY ---
+# Persistent record of every video the swarm has seen, keyed by video id. The
+# scan phase stores title/page, the edit phase stores the category, channel and
+# tags it read or wrote, so later runs can verify a video without opening its
+# edit modal.
+import json
+import sqlite3
+import threading
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS videos (
+    video_id    TEXT PRIMARY KEY,
+    title       TEXT,
+    category    TEXT,
+    channel     TEXT,
+    tags        TEXT,
+    page        INTEGER,
+    last_seen   REAL,
+    verified_at REAL,
+    last_edited REAL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+COLUMNS = ("video_id", "title", "category", "channel", "tags", "page", "last_seen", "verified_at", "last_edited")
+
+
+class VideoInventory:
+    def __init__(self, path):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    def record_seen(self, rows, page):
+        now = time.time()
+        data = [(r["video_id"], r["title"], page, now) for r in rows if r.get("video_id")]
+        if not data: return
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO videos (video_id, title, page, last_seen) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(video_id) DO UPDATE SET title=excluded.title, page=excluded.page, "
+                "last_seen=excluded.last_seen", data)
+            self._conn.commit()
+
+    def record_state(self, video_id, category, channel, tags, edited=False):
+        # Title is owned by the scan phase so it always matches the listing text
+        if not video_id: return
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO videos (video_id, category, channel, tags, last_seen, verified_at, last_edited) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(video_id) DO UPDATE SET category=excluded.category, channel=excluded.channel, "
+                "tags=excluded.tags, verified_at=excluded.verified_at, "
+                "last_edited=COALESCE(excluded.last_edited, videos.last_edited)",
+                (video_id, category, channel, tags, now, now, now if edited else None))
+            self._conn.commit()
+
+    def get(self, video_id):
+        if not video_id: return None
+        with self._lock:
+            row = self._conn.execute(f"SELECT {', '.join(COLUMNS)} FROM videos WHERE video_id = ?",
+                                     (video_id,)).fetchone()
+        return dict(zip(COLUMNS, row)) if row else None
+
+    def get_meta(self, key, default=None):
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def set_meta(self, key, value):
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, json.dumps(value)))
+            self._conn.commit()
+
+    def count(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM videos").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
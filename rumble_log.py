@@ -0,0 +1,48 @@
+# --- LOG PIPELINE ---
+# Workers never touch the UI: log records go into a SimpleQueue and the Tk
+# thread drains them in batches. While a swarm runs, every record is also
+# appended to a JSONL run log with its structured fields (worker, page, video,
+# action) for later analysis.
+import json
+import os
+import queue
+import time
+
+
+class RunLog:
+    def __init__(self, log_dir="logs"):
+        self.log_dir = log_dir
+        self.path = None
+        self._queue = queue.SimpleQueue()
+        self._file = None
+
+    def emit(self, message, **fields):
+        record = {"ts": round(time.time(), 3), "msg": message}
+        record.update((k, v) for k, v in fields.items() if v is not None)
+        self._queue.put(record)
+
+    def start_run(self):
+        self.end_run()
+        os.makedirs(self.log_dir, exist_ok=True)
+        self.path = os.path.join(self.log_dir, time.strftime("run_%Y%m%d_%H%M%S.jsonl"))
+        self._file = open(self.path, "a", encoding="utf-8")
+        return self.path
+
+    def end_run(self):
+        if self._file:
+            self.drain()
+            self._file.close()
+            self._file = None
+
+    def drain(self, max_items=1000):
+        # Called from a single consumer thread (the Tk loop or the CLI)
+        batch = []
+        while len(batch) < max_items:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        if batch and self._file:
+            self._file.write("".join(json.dumps(r, ensure_ascii=False) + "\n" for r in batch))
+            self._file.flush()
+        return batch
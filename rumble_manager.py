@@ -1,79 +1,26 @@
-import sys
 import os
-import re
-
-# --- HOTFIX FOR PYTHON 3.12+ REMOVAL OF DISTUTILS ---
-if sys.version_info >= (3, 12):
-    try:
-        import setuptools
-    except ImportError:
-        pass
-# ----------------------------------------------------
-
-import customtkinter as ctk
-from tkinter import ttk, messagebox
 import threading
-import queue
 import time
 import pickle
-from bs4 import BeautifulSoup
-import undetected_chromedriver as uc
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import Select
-from selenium.common.exceptions import StaleElementReferenceException, ElementClickInterceptedException, \
-    WebDriverException, SessionNotCreatedException
+
+import customtkinter as ctk
+from tkinter import ttk, messagebox, filedialog
+from rumble_engine import SwarmEngine, find_browsers, browser_binary, load_settings, save_settings, load_rules, \
+    COOKIES_FILE, CHANNELS_FILE, RULES_FILE, UA_FILE, WAIT_CEILING, PLAN_DIR
+from rumble_governor import RECYCLE_MB, RECYCLE_PAGES
+from rumble_scan import RUMBLE_BASE
+from rumble_rules import TAG_MODES
 
 # --- CONFIGURATION ---
 ctk.set_appearance_mode("Dark")
 ctk.set_default_color_theme("blue")
 
-# --- FILES ---
-COOKIES_FILE = "rumble_cookies.pkl"
-CHANNELS_FILE = "rumble_channels.pkl"
-RULES_FILE = "rumble_rules.pkl"
-SETTINGS_FILE = "rumble_settings.pkl"
+# --- LOG VIEW ---
+LOG_MAX_LINES = 2000  # visible log is trimmed to this many lines
+LOG_DRAIN_MS = 100  # how often the Tk thread flushes queued log records
 ICON_FILE = "icon.ico"
 
 
-# --- BROWSER DETECTION HELPER ---
-def find_browsers():
-    found = {"Auto-Detect": ""}
-    prog_files = os.environ.get("PROGRAMFILES", "C:\\Program Files")
-    prog_files_x86 = os.environ.get("PROGRAMFILES(X86)", "C:\\Program Files (x86)")
-    local_app_data = os.environ.get("LOCALAPPDATA", "C:\\Users\\Default\\AppData\\Local")
-
-    candidates = {
-        "Google Chrome": [
-            os.path.join(prog_files, "Google\\Chrome\\Application\\chrome.exe"),
-            os.path.join(prog_files_x86, "Google\\Chrome\\Application\\chrome.exe")
-        ],
-        "Brave Browser": [
-            os.path.join(prog_files, "BraveSoftware\\Brave-Browser\\Application\\brave.exe"),
-            os.path.join(prog_files_x86, "BraveSoftware\\Brave-Browser\\Application\\brave.exe"),
-            os.path.join(local_app_data, "BraveSoftware\\Brave-Browser\\Application\\brave.exe")
-        ],
-        "Vivaldi": [
-            os.path.join(local_app_data, "Vivaldi\\Application\\vivaldi.exe")
-        ],
-        "Opera": [
-            os.path.join(local_app_data, "Programs\\Opera\\launcher.exe"),
-            os.path.join(prog_files, "Opera\\launcher.exe")
-        ],
-        "Opera GX": [
-            os.path.join(local_app_data, "Programs\\Opera GX\\launcher.exe")
-        ]
-    }
-
-    for name, paths in candidates.items():
-        for path in paths:
-            if os.path.exists(path):
-                found[name] = path
-                break
-    return found
-
-
 class RumbleManagerApp(ctk.CTk):
     def __init__(self):
         super().__init__()
@@ -89,12 +36,8 @@ class RumbleManagerApp(ctk.CTk):
                 pass
 
         # --- Logic State ---
-        self.is_running = False
         self.rules = []
-        self.page_queue = queue.Queue()
-        self.drivers = []
-        self.threads = []
-        self.log_lock = threading.Lock()
+        self.engine = SwarmEngine(on_done=lambda: self.after(0, self._reset_controls))
         self.detected_browsers = find_browsers()
 
         # --- Variables ---
@@ -104,6 +47,18 @@ class RumbleManagerApp(ctk.CTk):
         self.start_page_var = ctk.StringVar(value="2")  # DEFAULT TO PAGE 2
         self.dry_run_var = ctk.BooleanVar(value=True)
         self.headless_var = ctk.BooleanVar(value=True)
+        self.scan_mode_var = ctk.StringVar(value="Browser")
+        self.edit_mode_var = ctk.StringVar(value="Direct")
+        self.skip_verified_var = ctk.BooleanVar(value=True)
+        self.incremental_var = ctk.BooleanVar(value=False)
+        self.adaptive_var = ctk.BooleanVar(value=False)
+        self.wait_ceiling_var = ctk.StringVar(value=str(WAIT_CEILING))
+        self.scan_threads_var = ctk.StringVar(value="2")
+        self.recycle_mb_var = ctk.StringVar(value=str(RECYCLE_MB))
+        self.recycle_pages_var = ctk.StringVar(value=str(RECYCLE_PAGES))
+        self.memory_budget_var = ctk.StringVar(value="0")
+        self.browser_mode_var = ctk.StringVar(value="Processes")
+        self.block_profile_var = ctk.StringVar(value="Safe")
         self.theme_var = ctk.StringVar(value="Dark")
 
         # --- Init ---
@@ -112,8 +67,10 @@ class RumbleManagerApp(ctk.CTk):
         self._load_rules()
         self._load_cached_channels()
         self._load_settings()
+        self._update_resume_button()
 
         self.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.after(LOG_DRAIN_MS, self._drain_logs)
 
     # --- SMOOTH SCALING LOGIC ---
     def _setup_scaling(self):
@@ -207,6 +164,9 @@ class RumbleManagerApp(ctk.CTk):
         ctk.CTkLabel(input_frame, text="Set Tags:").pack(side="left", padx=5)
         self.entry_tags = ctk.CTkEntry(input_frame, width=180, placeholder_text="Tag1, Tag2, Tag3")
         self.entry_tags.pack(side="left", padx=5)
+        self.cb_tag_mode = ctk.CTkComboBox(input_frame, values=["Replace", "Merge", "Remove"], width=100)
+        self.cb_tag_mode.set("Replace")
+        self.cb_tag_mode.pack(side="left", padx=5)
 
         ctk.CTkButton(input_frame, text="Add Rule", command=self.add_rule, fg_color="green", width=80).pack(side="left",
                                                                                                             padx=10)
@@ -215,17 +175,19 @@ class RumbleManagerApp(ctk.CTk):
         tree_frame = ctk.CTkFrame(rule_main_frame)
         tree_frame.pack(fill="x", padx=10, pady=10)
 
-        cols = ("Title", "Category", "Target", "Tags")
+        cols = ("Title", "Category", "Target", "Tags", "Mode")
         self.rule_list = ttk.Treeview(tree_frame, columns=cols, show="headings", height=6)
         self.rule_list.heading("Title", text="Title Keyword")
         self.rule_list.heading("Category", text="Category Keyword")
         self.rule_list.heading("Target", text="Target Channel")
         self.rule_list.heading("Tags", text="Tags to Apply")
+        self.rule_list.heading("Mode", text="Tag Mode")
 
         self.rule_list.column("Title", width=200)
         self.rule_list.column("Category", width=150)
         self.rule_list.column("Target", width=250)
         self.rule_list.column("Tags", width=300)
+        self.rule_list.column("Mode", width=90)
 
         self.rule_list.pack(side="left", fill="x", expand=True)
 
@@ -255,7 +217,7 @@ class RumbleManagerApp(ctk.CTk):
         ctrl_frame.pack(fill="x", padx=10, pady=5)
 
         # THREADS
-        ctk.CTkLabel(ctrl_frame, text="Worker Threads:").pack(side="left", padx=5)
+        ctk.CTkLabel(ctrl_frame, text="Editors:").pack(side="left", padx=5)
         self.slider_threads = ctk.CTkSlider(ctrl_frame, from_=1, to=20, number_of_steps=19, width=150,
                                             command=self.update_thread_label)
         self.slider_threads.set(4)
@@ -263,23 +225,87 @@ class RumbleManagerApp(ctk.CTk):
         self.lbl_threads = ctk.CTkLabel(ctrl_frame, text="4")
         self.lbl_threads.pack(side="left", padx=5)
 
+        # SCANNERS
+        ctk.CTkLabel(ctrl_frame, text="Scanners:").pack(side="left", padx=(20, 5))
+        self.entry_scan_threads = ctk.CTkEntry(ctrl_frame, textvariable=self.scan_threads_var, width=40)
+        self.entry_scan_threads.pack(side="left", padx=5)
+
         # NEW: START PAGE
         ctk.CTkLabel(ctrl_frame, text="Start Page:").pack(side="left", padx=(20, 5))
         self.entry_start_page = ctk.CTkEntry(ctrl_frame, textvariable=self.start_page_var, width=50)
         self.entry_start_page.pack(side="left", padx=5)
 
+        # SCAN MODE
+        ctk.CTkLabel(ctrl_frame, text="Scan Mode:").pack(side="left", padx=(20, 5))
+        self.cb_scan_mode = ctk.CTkComboBox(ctrl_frame, variable=self.scan_mode_var, values=["Browser", "HTTP"],
+                                            width=100)
+        self.cb_scan_mode.pack(side="left", padx=5)
+
+        # EDIT MODE
+        ctk.CTkLabel(ctrl_frame, text="Edit Mode:").pack(side="left", padx=(20, 5))
+        self.cb_edit_mode = ctk.CTkComboBox(ctrl_frame, variable=self.edit_mode_var, values=["Direct", "Modal"],
+                                            width=100)
+        self.cb_edit_mode.pack(side="left", padx=5)
+
+        # BROWSER MODE
+        ctk.CTkLabel(ctrl_frame, text="Workers As:").pack(side="left", padx=(20, 5))
+        self.cb_browser_mode = ctk.CTkComboBox(ctrl_frame, variable=self.browser_mode_var,
+                                               values=["Processes", "Tabs"], width=110)
+        self.cb_browser_mode.pack(side="left", padx=5)
+
+        # NETWORK BLOCKING
+        ctk.CTkLabel(ctrl_frame, text="Blocking:").pack(side="left", padx=(20, 5))
+        self.cb_block_profile = ctk.CTkComboBox(ctrl_frame, variable=self.block_profile_var, values=["Safe", "Off"],
+                                                width=80)
+        self.cb_block_profile.pack(side="left", padx=5)
+
+        # WAIT CEILING
+        ctk.CTkLabel(ctrl_frame, text="Wait Ceiling (s):").pack(side="left", padx=(20, 5))
+        self.entry_wait_ceiling = ctk.CTkEntry(ctrl_frame, textvariable=self.wait_ceiling_var, width=40)
+        self.entry_wait_ceiling.pack(side="left", padx=5)
+
         # SWITCHES
-        self.sw_dry = ctk.CTkSwitch(ctrl_frame, text="Dry Run", variable=self.dry_run_var)
+        self.sw_dry = ctk.CTkSwitch(ctrl_frame, text="Dry Run (Plan)", variable=self.dry_run_var)
         self.sw_dry.pack(side="left", padx=20)
 
         self.sw_head = ctk.CTkSwitch(ctrl_frame, text="Headless", variable=self.headless_var)
         self.sw_head.pack(side="left", padx=20)
 
+        self.sw_verified = ctk.CTkSwitch(ctrl_frame, text="Skip Verified", variable=self.skip_verified_var)
+        self.sw_verified.pack(side="left", padx=20)
+
+        self.sw_incremental = ctk.CTkSwitch(ctrl_frame, text="Incremental", variable=self.incremental_var)
+        self.sw_incremental.pack(side="left", padx=20)
+
+        self.sw_adaptive = ctk.CTkSwitch(ctrl_frame, text="Adaptive", variable=self.adaptive_var)
+        self.sw_adaptive.pack(side="left", padx=20)
+
+        # RESOURCES (browser recycling, memory budget)
+        res_frame = ctk.CTkFrame(exec_frame, fg_color="transparent")
+        res_frame.pack(fill="x", padx=10, pady=(0, 5))
+        ctk.CTkLabel(res_frame, text="Recycle Browser At (MB):").pack(side="left", padx=5)
+        self.entry_recycle_mb = ctk.CTkEntry(res_frame, textvariable=self.recycle_mb_var, width=60)
+        self.entry_recycle_mb.pack(side="left", padx=5)
+        ctk.CTkLabel(res_frame, text="Or After (pages):").pack(side="left", padx=(20, 5))
+        self.entry_recycle_pages = ctk.CTkEntry(res_frame, textvariable=self.recycle_pages_var, width=60)
+        self.entry_recycle_pages.pack(side="left", padx=5)
+        ctk.CTkLabel(res_frame, text="Memory Budget (MB, 0 = auto):").pack(side="left", padx=(20, 5))
+        self.entry_memory_budget = ctk.CTkEntry(res_frame, textvariable=self.memory_budget_var, width=70)
+        self.entry_memory_budget.pack(side="left", padx=5)
+
         # BUTTONS
         self.btn_stop = ctk.CTkButton(ctrl_frame, text="STOP", command=self.stop_processing, fg_color="red", width=80,
                                       state="disabled")
         self.btn_stop.pack(side="right", padx=10)
 
+        self.btn_apply_plan = ctk.CTkButton(ctrl_frame, text="APPLY PLAN...", command=self.apply_plan, width=110,
+                                            height=40)
+        self.btn_apply_plan.pack(side="right", padx=10)
+
+        self.btn_resume = ctk.CTkButton(ctrl_frame, text="RESUME LAST RUN", command=lambda: self.start_swarm(True),
+                                        width=130, height=40, state="disabled")
+        self.btn_resume.pack(side="right", padx=10)
+
         self.btn_start = ctk.CTkButton(ctrl_frame, text="LAUNCH SWARM", command=self.start_swarm, fg_color="green",
                                        font=("Roboto", 12, "bold"), height=40)
         self.btn_start.pack(side="right", padx=10)
@@ -322,98 +348,73 @@ class RumbleManagerApp(ctk.CTk):
         f = ctk.filedialog.askopenfilename(filetypes=[("Executables", "*.exe")])
         if f: self.manual_path_var.set(f)
 
-    def log(self, message):
-        with self.log_lock:
-            self.log_area.configure(state="normal")
-            self.log_area.insert("end", f"{message}\n")
-            self.log_area.see("end")
-            self.log_area.configure(state="disabled")
-            print(message)
+    def log(self, message, worker=None, page=None, video=None, action=None):
+        # Safe from any thread; the record is shown by _drain_logs on the Tk thread
+        self.engine.log(message, worker, page, video, action)
+
+    def _show_logs(self, batch):
+        if not batch: return
+        text = "".join(f"{r['msg']}\n" for r in batch)
+        print(text, end="")
+        self.log_area.configure(state="normal")
+        self.log_area.insert("end", text)
+        lines = int(self.log_area.index("end-1c").split(".")[0])
+        if lines > LOG_MAX_LINES:
+            self.log_area.delete("1.0", f"{lines - LOG_MAX_LINES}.0")
+        self.log_area.see("end")
+        self.log_area.configure(state="disabled")
 
-            # --- SETTINGS I/O ---
+    def _drain_logs(self):
+        self._show_logs(self.engine.run_log.drain())
+        self.after(LOG_DRAIN_MS, self._drain_logs)
 
-    def _save_settings(self):
-        data = {
+    # --- SETTINGS I/O ---
+    def _collect_settings(self):
+        return {
             "browser": self.browser_var.get(),
             "manual_path": self.manual_path_var.get(),
             "threads": self.slider_threads.get(),
+            "scan_threads": self.scan_threads_var.get(),
+            "recycle_mb": self.recycle_mb_var.get(),
+            "recycle_pages": self.recycle_pages_var.get(),
+            "memory_budget_mb": self.memory_budget_var.get(),
             "dry": self.dry_run_var.get(),
             "head": self.headless_var.get(),
-            "start_page": self.start_page_var.get()
+            "start_page": self.start_page_var.get(),
+            "scan_mode": self.scan_mode_var.get(),
+            "edit_mode": self.edit_mode_var.get(),
+            "skip_verified": self.skip_verified_var.get(),
+            "incremental": self.incremental_var.get(),
+            "adaptive": self.adaptive_var.get(),
+            "wait_ceiling": self.wait_ceiling_var.get(),
+            "browser_mode": self.browser_mode_var.get(),
+            "block_profile": self.block_profile_var.get()
         }
-        try:
-            pickle.dump(data, open(SETTINGS_FILE, "wb"))
-        except:
-            pass
-
-    def _load_settings(self):
-        if os.path.exists(SETTINGS_FILE):
-            try:
-                data = pickle.load(open(SETTINGS_FILE, "rb"))
-                self.browser_var.set(data.get("browser", "Auto-Detect"))
-                self.manual_path_var.set(data.get("manual_path", ""))
-                self.slider_threads.set(data.get("threads", 4))
-                self.update_thread_label(data.get("threads", 4))
-                self.dry_run_var.set(data.get("dry", True))
-                self.headless_var.set(data.get("head", True))
-                self.start_page_var.set(data.get("start_page", "2"))
-            except:
-                pass
-
-    # --- DRIVER FACTORY (AUTO-HEAL) ---
-    def get_driver(self, headless=False, force_version=None):
-        options = uc.ChromeOptions()
-        if headless:
-            options.add_argument("--headless=new")
-        options.add_argument("--start-maximized")
-        options.add_argument("--disable-popup-blocking")
-        if headless:
-            options.add_argument("--blink-settings=imagesEnabled=false")
-
-        binary_path = ""
-        manual = self.manual_path_var.get()
-        if manual and os.path.exists(manual):
-            binary_path = manual
-        else:
-            choice = self.browser_var.get()
-            if choice in self.detected_browsers:
-                binary_path = self.detected_browsers[choice]
 
-        if binary_path:
-            options.binary_location = binary_path
+    def _save_settings(self):
+        save_settings(self._collect_settings())
 
-        try:
-            if force_version:
-                self.log(f"Attempting driver launch (Version {force_version})...")
-                driver = uc.Chrome(options=options, version_main=force_version)
-            else:
-                driver = uc.Chrome(options=options)
-            return driver
-
-        except SessionNotCreatedException as e:
-            msg = str(e)
-            if "This version of ChromeDriver only supports Chrome version" in msg:
-                self.log("Driver Version Mismatch Detected.")
-                match = re.search(r"Current browser version is (\d+)", msg)
-                if match:
-                    detected_version = int(match.group(1))
-                    self.log(f"Detected Browser Version: {detected_version}. Downgrading driver...")
-                    return self.get_driver(headless, force_version=detected_version)
-            raise e
-
-    def load_cookies(self, driver):
-        if os.path.exists(COOKIES_FILE):
-            driver.get("https://rumble.com/404")
-            try:
-                with open(COOKIES_FILE, "rb") as f:
-                    cookies = pickle.load(f)
-                    for c in cookies:
-                        try:
-                            driver.add_cookie(c)
-                        except:
-                            pass
-            except:
-                pass
+    def _load_settings(self):
+        data = load_settings()
+        self.browser_var.set(data["browser"])
+        self.manual_path_var.set(data["manual_path"])
+        self.slider_threads.set(data["threads"])
+        self.update_thread_label(data["threads"])
+        self.scan_threads_var.set(str(data["scan_threads"]))
+        self.recycle_mb_var.set(str(data["recycle_mb"]))
+        self.recycle_pages_var.set(str(data["recycle_pages"]))
+        self.memory_budget_var.set(str(data["memory_budget_mb"]))
+        self.dry_run_var.set(data["dry"])
+        self.headless_var.set(data["head"])
+        self.start_page_var.set(data["start_page"])
+        self.scan_mode_var.set(data["scan_mode"])
+        self.edit_mode_var.set(data["edit_mode"])
+        self.skip_verified_var.set(data["skip_verified"])
+        self.incremental_var.set(data["incremental"])
+        self.adaptive_var.set(data["adaptive"])
+        self.wait_ceiling_var.set(data["wait_ceiling"])
+        self.browser_mode_var.set(data["browser_mode"])
+        self.block_profile_var.set(data["block_profile"])
 
     # --- LOGIN ---
     def perform_login(self):
@@ -423,8 +424,11 @@ class RumbleManagerApp(ctk.CTk):
     def _login_process(self):
         self.log("Launching login browser...")
         try:
-            driver = self.get_driver(headless=False)
-            driver.get("https://rumble.com/login.php")
+            from rumble_browser import get_driver, save_user_agent
+            settings = self._collect_settings()
+            driver = get_driver(headless=False, binary_path=browser_binary(settings, self.detected_browsers),
+                                log=self.log)
+            driver.get(f"{RUMBLE_BASE}/login.php")
             self.log("Please log in. Waiting 60s...")
             start = time.time()
             while time.time() - start < 60:
@@ -432,6 +436,7 @@ class RumbleManagerApp(ctk.CTk):
                     self.log("Login Success! Saving cookies...")
                     time.sleep(2)
                     pickle.dump(driver.get_cookies(), open(COOKIES_FILE, "wb"))
+                    save_user_agent(driver, UA_FILE)
                     self._fetch_channels_internal(driver)
                     break
                 time.sleep(1)
@@ -440,23 +445,11 @@ class RumbleManagerApp(ctk.CTk):
             self.log(f"Login failed/closed: {e}")
 
     def _fetch_channels_internal(self, driver):
+        from rumble_browser import fetch_channels
         self.log("Fetching channels...")
         try:
-            driver.get("https://rumble.com/account/content")
-            triggers = WebDriverWait(driver, 10).until(
-                EC.presence_of_all_elements_located((By.CSS_SELECTOR, ".my-videos-nav .open-menu")))
-            if triggers:
-                driver.execute_script("arguments[0].click();", triggers[0])
-                time.sleep(0.5)
-                edit_btn = WebDriverWait(driver, 5).until(
-                    EC.element_to_be_clickable((By.CSS_SELECTOR, ".dd-menu[style*='block'] #edit")))
-                driver.execute_script("arguments[0].click();", edit_btn)
-                WebDriverWait(driver, 10).until(EC.visibility_of_element_located((By.ID, "video-form")))
-                driver.execute_script("arguments[0].click();",
-                                      driver.find_element(By.CSS_SELECTOR, "li[data-tab='settings']"))
-                time.sleep(1)
-                select = Select(driver.find_element(By.ID, "channelId"))
-                chans = [o.text for o in select.options]
+            chans = fetch_channels(driver, WAIT_CEILING)
+            if chans:
                 pickle.dump(chans, open(CHANNELS_FILE, "wb"))
                 self.after(0, lambda: self.update_channel_dropdown(chans))
                 self.log(f"Saved {len(chans)} channels.")
@@ -477,17 +470,14 @@ class RumbleManagerApp(ctk.CTk):
 
     # --- RULES ---
     def _load_rules(self):
-        if os.path.exists(RULES_FILE):
-            try:
-                self.rules = pickle.load(open(RULES_FILE, "rb"))
-                for r in self.rules:
-                    title = r.get('title', '')
-                    cat = r.get('cat', '')
-                    target = r.get('target', '')
-                    tags = r.get('tags', '')
-                    self.rule_list.insert("", "end", values=(title, cat, target, tags))
-            except:
-                pass
+        self.rules = load_rules()
+        for r in self.rules:
+            title = r.get('title', '')
+            cat = r.get('cat', '')
+            target = r.get('target', '')
+            tags = r.get('tags', '')
+            mode = r.get('tag_mode', 'replace').capitalize()
+            self.rule_list.insert("", "end", values=(title, cat, target, tags, mode))
 
     def _save_rules(self):
         pickle.dump(self.rules, open(RULES_FILE, "wb"))
@@ -497,10 +487,12 @@ class RumbleManagerApp(ctk.CTk):
         c = self.entry_cat_kw.get().strip()
         tg = self.entry_target_channel.get()
         tags = self.entry_tags.get().strip()
+        mode = self.cb_tag_mode.get()
+        if mode.lower() not in TAG_MODES: mode = "Replace"
 
         if not tg: return
-        self.rules.append({"title": t, "cat": c, "target": tg, "tags": tags})
-        self.rule_list.insert("", "end", values=(t, c, tg, tags))
+        self.rules.append({"title": t, "cat": c, "target": tg, "tags": tags, "tag_mode": mode.lower()})
+        self.rule_list.insert("", "end", values=(t, c, tg, tags, mode))
         self._save_rules()
 
     def edit_rule(self):
@@ -517,6 +509,7 @@ class RumbleManagerApp(ctk.CTk):
         self.entry_tags.delete(0, "end")
         tag_val = values[3] if len(values) > 3 else ""
         self.entry_tags.insert(0, tag_val)
+        self.cb_tag_mode.set(values[4] if len(values) > 4 else "Replace")
 
         self.delete_rule()
 
@@ -529,263 +522,54 @@ class RumbleManagerApp(ctk.CTk):
             self._save_rules()
 
     # --- SWARM LOGIC ---
-    def start_swarm(self):
+    def start_swarm(self, resume=False, plan_path=None):
         if not os.path.exists(COOKIES_FILE):
             messagebox.showerror("Error", "Login first.")
             return
         if not self.rules:
             messagebox.showerror("Error", "No rules.")
             return
-        if self.is_running: return
+        if self.engine.run_active: return
 
         self._save_settings()
-        self.is_running = True
+        if self.engine.start(self.rules, self._collect_settings(), resume=resume, plan_path=plan_path) is None:
+            return
         self.btn_start.configure(state="disabled")
+        self.btn_resume.configure(state="disabled")
+        self.btn_apply_plan.configure(state="disabled")
         self.btn_stop.configure(state="normal")
 
-        # Get Start Page
-        try:
-            start_pg = int(self.start_page_var.get())
-            if start_pg < 1: start_pg = 1
-        except:
-            start_pg = 1
-
-        with self.page_queue.mutex:
-            self.page_queue.queue.clear()
-
-        # Queue pages starting from user selection
-        for i in range(start_pg, start_pg + 150):
-            self.page_queue.put(i)
-
-        threading.Thread(target=self.init_workers, daemon=True).start()
-
-    def init_workers(self):
-        headless = self.headless_var.get()
-        dry_run = self.dry_run_var.get()
-        num_workers = int(self.slider_threads.get())
-
-        self.log(f"Initializing {num_workers} workers...")
-
-        for i in range(num_workers):
-            if not self.is_running: break
-            try:
-                d = self.get_driver(headless=headless)
-                self.load_cookies(d)
-                self.drivers.append(d)
-                self.log(f"  Worker {i + 1} Ready.")
-                time.sleep(1)
-            except Exception as e:
-                self.log(f"  Worker {i + 1} Failed: {e}")
-
-        self.log("All workers ready. Swarm active.")
-
-        for i, driver in enumerate(self.drivers):
-            t = threading.Thread(target=self.worker_task, args=(i + 1, driver, dry_run), daemon=True)
-            self.threads.append(t)
-            t.start()
-
-    def worker_task(self, worker_id, driver, dry_run):
-        while self.is_running:
-            try:
-                page_num = self.page_queue.get(timeout=1)
-            except queue.Empty:
-                break
-
-            try:
-                self.log(f"[W{worker_id}] Processing Page {page_num}...")
-                driver.get(f"https://rumble.com/account/content?&pg={page_num}")
-
-                try:
-                    WebDriverWait(driver, 5).until(EC.presence_of_element_located((By.CSS_SELECTOR, ".my-videos-nav")))
-                except:
-                    self.log(f"[W{worker_id}] Page {page_num} empty. Stopping this worker.")
-                    with self.page_queue.mutex:
-                        self.page_queue.queue.clear()
-                    break
-
-                soup = BeautifulSoup(driver.page_source, 'html.parser')
-                navs = soup.select(".my-videos-nav")
-                to_process = []
-
-                for idx, nav in enumerate(navs):
-                    row_text = ""
-                    article_container = nav.find_parent("article")
-                    if not article_container: article_container = nav.find_parent("div", class_="media-by-user")
-
-                    if article_container:
-                        title_el = article_container.select_one(".video-title")
-                        if title_el:
-                            row_text = title_el.get_text(strip=True)
-                        else:
-                            row_text = article_container.get_text(" ", strip=True)
-                    else:
-                        row_text = "Unknown"
-
-                    match = None
-                    for r in self.rules:
-                        title_kw = r.get('title', '').strip()
-                        cat_kw = r.get('cat', '').strip()
-                        if title_kw:
-                            if title_kw.lower() in row_text.lower():
-                                match = r
-                                break
-                        elif not title_kw and cat_kw:
-                            match = r
-                            break
-
-                    if match:
-                        self.log(f"[W{worker_id}] [+] Match Found: {row_text[:30]}...")
-                        to_process.append(idx)
-
-                if to_process:
-                    self.process_matches_on_page(worker_id, driver, to_process, dry_run)
-
-            except Exception as e:
-                self.log(f"[W{worker_id}] Error Pg {page_num}: {e}")
-
-        self.log(f"[W{worker_id}] Finished.")
-
-    def process_matches_on_page(self, worker_id, driver, indices, dry_run):
-        for vid_idx in indices:
-            if not self.is_running: break
-            success = False
-            for attempt in range(3):
-                try:
-                    driver.refresh()
-                    WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.CSS_SELECTOR, ".my-videos-nav")))
-                    triggers = driver.find_elements(By.CSS_SELECTOR, ".my-videos-nav .open-menu")
-                    if vid_idx >= len(triggers): break
-                    trigger = triggers[vid_idx]
-                    driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", trigger)
-                    time.sleep(0.3)
-                    driver.execute_script("arguments[0].click();", trigger)
-                    edit_btn = WebDriverWait(driver, 5).until(
-                        EC.element_to_be_clickable((By.CSS_SELECTOR, ".dd-menu[style*='block'] #edit")))
-                    time.sleep(0.2)
-                    driver.execute_script("arguments[0].click();", edit_btn)
-                    WebDriverWait(driver, 5).until(EC.visibility_of_element_located((By.ID, "video-form")))
-                    success = True
-                    break
-                except (StaleElementReferenceException, ElementClickInterceptedException, WebDriverException):
-                    time.sleep(1)
-                except Exception:
-                    break
-
-            if not success: continue
-
-            try:
-                # 1. Grab Details from DETAILS tab (default)
-                try:
-                    details_tab = driver.find_element(By.CSS_SELECTOR, "li[data-tab='details']")
-                    if "active" not in details_tab.get_attribute("class"):
-                        driver.execute_script("arguments[0].click();", details_tab)
-                        time.sleep(0.2)
-                except:
-                    pass
-
-                title_val = driver.find_element(By.ID, "title").get_attribute("value")
-                tags_input = driver.find_element(By.ID, "tags")
-                current_tags = tags_input.get_attribute("value")
-
-                cat_select = Select(driver.find_element(By.ID, "siteChannelId"))
-                current_cat = cat_select.first_selected_option.text
-
-                # 2. Switch to Settings to get Channel
-                settings_tab = driver.find_element(By.CSS_SELECTOR, "li[data-tab='settings']")
-                driver.execute_script("arguments[0].click();", settings_tab)
-                time.sleep(0.5)
-
-                chan_select = Select(driver.find_element(By.ID, "channelId"))
-                current_chan = chan_select.first_selected_option.text
-
-                # 3. Find Rule Match
-                target_rule = None
-                for r in self.rules:
-                    t_kw = r.get('title', '').strip().lower()
-                    c_kw = r.get('cat', '').strip().lower()
-                    if t_kw and not c_kw:
-                        if t_kw in title_val.lower(): target_rule = r; break
-                    elif t_kw and c_kw:
-                        if t_kw in title_val.lower() and c_kw in current_cat.lower(): target_rule = r; break
-                    elif not t_kw and c_kw:
-                        if c_kw in current_cat.lower(): target_rule = r; break
-
-                if not target_rule: continue
-
-                # 4. Calculate Changes
-                target_chan_name = target_rule['target'].strip()
-                target_tags_val = target_rule.get('tags', '').strip()
-
-                needs_chan_update = False
-                needs_tag_update = False
-
-                # Check Channel (Case Insensitive Fuzzy)
-                if target_chan_name and target_chan_name.lower() not in current_chan.strip().lower():
-                    needs_chan_update = True
-
-                # Check Tags
-                if target_tags_val and target_tags_val != current_tags.strip():
-                    needs_tag_update = True
-
-                if needs_chan_update or needs_tag_update:
-                    log_items = []
-                    if needs_chan_update: log_items.append(f"Channel -> {target_chan_name}")
-                    if needs_tag_update: log_items.append(f"Tags -> {target_tags_val[:15]}...")
-                    self.log(f"[W{worker_id}] Updating: {', '.join(log_items)}")
-
-                    if not dry_run:
-                        # Apply Channel (We are on Settings Tab)
-                        if needs_chan_update:
-                            try:
-                                chan_select.select_by_visible_text(target_chan_name)
-                            except:
-                                found = False
-                                for opt in chan_select.options:
-                                    if target_chan_name.lower() in opt.text.lower():
-                                        chan_select.select_by_visible_text(opt.text)
-                                        found = True
-                                        break
-                                if not found:
-                                    self.log(f"[W{worker_id}] Warn: Target channel '{target_chan_name}' not found.")
-
-                        # Apply Tags (Switch back to Details)
-                        if needs_tag_update:
-                            driver.execute_script("arguments[0].click();", details_tab)
-                            time.sleep(0.5)
-                            tags_input = driver.find_element(By.ID, "tags")
-                            tags_input.clear()
-                            tags_input.send_keys(target_tags_val)
-
-                        # Save
-                        save_btn = driver.find_element(By.CSS_SELECTOR, ".overlay-dialog .buttons [id='0']")
-                        driver.execute_script("arguments[0].click();", save_btn)
-                        time.sleep(1.5)
-                        self.log(f"[W{worker_id}] -> Saved.")
-                    else:
-                        self.log(f"[W{worker_id}] -> Dry Run: Changes Skipped.")
-                else:
-                    self.log(f"[W{worker_id}] -> Already correct.")
-
-            except Exception as e:
-                self.log(f"[W{worker_id}] Edit Glitch: {str(e).splitlines()[0]}")
+    def apply_plan(self):
+        # Executes a plan written by a dry run; nothing else is scanned
+        path = filedialog.askopenfilename(title="Apply Plan", initialdir=PLAN_DIR if os.path.isdir(PLAN_DIR) else ".",
+                                          filetypes=[("Change plans", "*.json")])
+        if path: self.start_swarm(plan_path=path)
+
+    def _update_resume_button(self):
+        # Enabled while the last run's checkpoint is unfinished (stopped, crashed or closed)
+        last = self.engine.last_run()
+        self.btn_resume.configure(state="normal" if last else "disabled")
+        return last
+
+    def _reset_controls(self):
+        self._show_logs(self.engine.run_log.drain())
+        self.engine.run_log.end_run()
+        self.btn_start.configure(state="normal")
+        self.btn_apply_plan.configure(state="normal")
+        self.btn_stop.configure(state="disabled")
+        self._update_resume_button()
 
     def stop_processing(self):
-        self.is_running = False
-        self.btn_start.configure(state="normal")
+        # Launch/Resume/Apply come back in _reset_controls, once the last worker has exited
+        self.engine.stop()
         self.btn_stop.configure(state="disabled")
-        self.log("Stopping swarm...")
 
     def on_close(self):
-        self.is_running = False
         self.log("Closing drivers...")
-        for d in self.drivers:
-            try:
-                d.quit()
-            except:
-                pass
+        self.engine.close()
         self.destroy()
 
 
 if __name__ == "__main__":
     app = RumbleManagerApp()
-    app.mainloop()
\ No newline at end of file
+    app.mainloop()
@@ -0,0 +1,97 @@
+# --- RUN METRICS ---
+# Per-phase timings recorded by every worker, aggregated into percentiles per
+# phase and per worker at the end of a run and exported as JSON and CSV.
+import csv
+import json
+import math
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+PHASES = ("page_load", "wait_selector", "parse", "modal_open", "field_read", "save", "save_confirm")
+
+
+def percentile(sorted_vals, q):
+    # Nearest-rank percentile of an already sorted list
+    if not sorted_vals: return 0.0
+    k = max(0, min(len(sorted_vals) - 1, math.ceil(q / 100.0 * len(sorted_vals)) - 1))
+    return sorted_vals[k]
+
+
+def describe(values):
+    vals = sorted(values)
+    return {"n": len(vals), "p50": percentile(vals, 50), "p90": percentile(vals, 90),
+            "p99": percentile(vals, 99), "max": vals[-1] if vals else 0.0, "total": sum(vals)}
+
+
+class RunMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._samples = defaultdict(list)
+        self.started = time.time()
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+        self.started = time.time()
+
+    def record(self, worker, phase, seconds):
+        key = f"W{worker}" if isinstance(worker, int) else str(worker)
+        with self._lock:
+            self._samples[(key, phase)].append(seconds)
+
+    @contextmanager
+    def phase(self, worker, phase):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(worker, phase, time.perf_counter() - t0)
+
+    def _ordered_phases(self, names):
+        return [p for p in PHASES if p in names] + sorted(n for n in names if n not in PHASES)
+
+    def summary(self):
+        with self._lock:
+            samples = {k: list(v) for k, v in self._samples.items()}
+        by_phase = defaultdict(list)
+        by_worker = defaultdict(lambda: defaultdict(list))
+        for (worker, phase), vals in samples.items():
+            by_phase[phase].extend(vals)
+            by_worker[worker][phase].extend(vals)
+        return {
+            "elapsed": time.time() - self.started,
+            "phases": {p: describe(by_phase[p]) for p in self._ordered_phases(by_phase)},
+            "workers": {w: {p: describe(ph[p]) for p in self._ordered_phases(ph)}
+                        for w, ph in sorted(by_worker.items())},
+        }
+
+    def report_lines(self, summary=None):
+        summary = summary or self.summary()
+        if not summary["phases"]: return []
+        lines = [f"Performance over {summary['elapsed']:.1f}s (seconds):",
+                 f"  {'phase':<16}{'n':>6}{'p50':>8}{'p90':>8}{'p99':>8}{'max':>8}{'total':>9}"]
+        for p, d in summary["phases"].items():
+            lines.append(f"  {p:<16}{d['n']:>6}{d['p50']:>8.2f}{d['p90']:>8.2f}{d['p99']:>8.2f}"
+                         f"{d['max']:>8.2f}{d['total']:>9.1f}")
+        lines.append("  per worker (p50):")
+        for w, phases in summary["workers"].items():
+            cells = ", ".join(f"{p} {d['p50']:.2f}" for p, d in phases.items())
+            lines.append(f"    [{w}] {cells}")
+        return lines
+
+    def export(self, base_path, summary=None):
+        # Writes <base>.json (full summary) and <base>.csv (one row per worker/phase)
+        summary = summary or self.summary()
+        with open(base_path + ".json", "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+        with open(base_path + ".csv", "w", newline="", encoding="utf-8") as f:
+            w = csv.writer(f)
+            w.writerow(["worker", "phase", "n", "p50", "p90", "p99", "max", "total"])
+            for p, d in summary["phases"].items():
+                w.writerow(["ALL", p, d["n"], d["p50"], d["p90"], d["p99"], d["max"], d["total"]])
+            for worker, phases in summary["workers"].items():
+                for p, d in phases.items():
+                    w.writerow([worker, p, d["n"], d["p50"], d["p90"], d["p99"], d["max"], d["total"]])
+        return base_path + ".json", base_path + ".csv"
@@ -0,0 +1,117 @@
+# --- NETWORK BLOCKING ---
+# Worker browsers only need the listing markup, Rumble's own scripts and the
+# edit form. Requests for everything else are refused by the browser itself
+# (DevTools Network.setBlockedURLs) before they hit the network. Counts come
+# from the browsers' performance logs: every refused request shows up there as
+# a failed load with blockedReason "inspector".
+import json
+import os
+import threading
+from collections import Counter
+
+# Resource types are blocked through URL patterns, the only thing the
+# browser-side blocklist understands.
+RESOURCE_PATTERNS = {
+    "image": ["*.jpg*", "*.jpeg*", "*.png*", "*.gif*", "*.webp*", "*.avif*", "*.ico*"],
+    "font": ["*.woff*", "*.ttf*", "*.otf*", "*.eot*"],
+    "media": ["*.mp4*", "*.webm*", "*.m3u8*", "*.m4s*", "*.vtt*"],
+    "stylesheet": ["*.css*"],
+}
+
+# Ads, analytics and embeds that never matter to the edit flow
+TRACKER_PATTERNS = [
+    "*google-analytics.com*", "*googletagmanager.com*", "*googlesyndication.com*", "*doubleclick.net*",
+    "*googleadservices.com*", "*adservice.google.*", "*amazon-adsystem.com*", "*connect.facebook.net*",
+    "*scorecardresearch.com*", "*quantserve.com*", "*hotjar.com*", "*taboola.com*", "*outbrain.com*",
+    "*revcontent.com*", "*pubmatic.com*", "*rubiconproject.com*", "*adnxs.com*", "*criteo.*",
+]
+
+# "Safe" keeps stylesheets and scripts: the edit modal's visibility checks
+# depend on CSS and the form is built by Rumble's JS.
+PROFILES = {
+    "Off": {"types": [], "patterns": []},
+    "Safe": {"types": ["image", "font", "media"], "patterns": TRACKER_PATTERNS},
+}
+
+# Typical transfer size per blocked request (bytes). A refused request never
+# reports its size, so "bytes saved" is an estimate; bench_swarm.py --block
+# measures the real difference.
+TYPICAL_BYTES = {"Image": 25000, "Font": 40000, "Media": 400000, "Stylesheet": 20000, "Script": 60000,
+                 "XHR": 2000, "Fetch": 2000, "Other": 5000}
+
+
+def load_blocklist(path):
+    # Extra entries, one per line: a URL pattern ("*ads.example.com*") or a
+    # resource type ("type:stylesheet"). Lines starting with # are ignored.
+    types, patterns = [], []
+    if not os.path.exists(path): return types, patterns
+    try:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith("#"): continue
+                if line.startswith("type:"):
+                    types.append(line[5:].strip().lower())
+                else:
+                    patterns.append(line)
+    except OSError:
+        pass
+    return types, patterns
+
+
+def block_patterns(profile, extra_types=(), extra_patterns=()):
+    if profile not in PROFILES or profile == "Off": return []
+    base = PROFILES[profile]
+    patterns = []
+    for t in list(base["types"]) + list(extra_types):
+        patterns.extend(p for p in RESOURCE_PATTERNS.get(t, []) if p not in patterns)
+    patterns.extend(p for p in list(base["patterns"]) + list(extra_patterns) if p not in patterns)
+    return patterns
+
+
+class NetworkStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._blocked = Counter()
+            self._requests = 0
+            self._bytes = 0
+
+    def add_log(self, entries):
+        # entries: driver.get_log("performance")
+        blocked, requests, received = Counter(), 0, 0
+        for entry in entries:
+            try:
+                msg = json.loads(entry["message"])["message"]
+            except (KeyError, TypeError, ValueError):
+                continue
+            method, params = msg.get("method"), msg.get("params", {})
+            if method == "Network.requestWillBeSent":
+                requests += 1
+            elif method == "Network.loadingFinished":
+                received += params.get("encodedDataLength", 0)
+            elif method == "Network.loadingFailed" and params.get("blockedReason") == "inspector":
+                blocked[params.get("type", "Other")] += 1
+        with self._lock:
+            self._blocked.update(blocked)
+            self._requests += requests
+            self._bytes += received
+
+    def summary(self):
+        with self._lock:
+            blocked = dict(self._blocked)
+            requests, received = self._requests, self._bytes
+        saved = sum(n * TYPICAL_BYTES.get(t, TYPICAL_BYTES["Other"]) for t, n in blocked.items())
+        return {"requests": requests, "blocked": sum(blocked.values()), "by_type": blocked,
+                "bytes": received, "saved_bytes": saved}
+
+    def report_lines(self, summary=None):
+        s = summary or self.summary()
+        if not s["requests"]: return []
+        line = f"Network: {s['requests']} requests, {s['bytes'] / 1e6:.1f} MB downloaded"
+        if not s["blocked"]: return [line + ", nothing blocked."]
+        types = ", ".join(f"{t} {n}" for t, n in sorted(s["by_type"].items(), key=lambda kv: -kv[1]))
+        return [line + f"; blocked {s['blocked']} requests ({types}), ~{s['saved_bytes'] / 1e6:.1f} MB saved (est.)."]
@@ -0,0 +1,129 @@
+# --- CHANGE PLAN ---
+# A dry run produces a plan: one entry per video that needs a change, with the
+# state it was read in, the target values and the rule that matched. Plans are
+# pretty-printed JSON sorted by page and position, so two plans can be diffed
+# with any diff tool (or `python rumble_plan.py diff old.json new.json`). An
+# apply run executes only the plan's entries and skips any video whose state
+# changed since the plan was made, so the same plan can be replayed safely.
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+
+PLAN_VERSION = 1
+ENTRY_FIELDS = ("video_id", "page", "position", "title", "category", "current_channel", "current_tags",
+                "target_channel", "target_tags", "rule")
+
+
+def plan_entry(row, rule, category, current_chan, current_tags, new_chan, new_tags):
+    return {"video_id": row["video_id"], "page": row.get("page"), "position": row.get("position"),
+            "title": row["title"], "category": category, "current_channel": current_chan,
+            "current_tags": current_tags, "target_channel": new_chan, "target_tags": new_tags,
+            "rule": dict(rule)}
+
+
+class ChangePlan:
+    def __init__(self, entries=None, created=None, complete=False):
+        self._lock = threading.Lock()
+        self.entries = {e["video_id"]: e for e in entries or []}
+        self.created = created or time.time()
+        self.complete = complete
+
+    def __len__(self):
+        return len(self.entries)
+
+    def add(self, entry):
+        with self._lock:
+            self.entries[entry["video_id"]] = entry
+
+    def sorted_entries(self):
+        with self._lock:
+            entries = list(self.entries.values())
+        return sorted(entries, key=lambda e: (e["page"] or 0, e["position"] or 0, e["video_id"]))
+
+    def by_page(self):
+        pages = {}
+        for e in self.sorted_entries():
+            pages.setdefault(e["page"], []).append(e)
+        return pages
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        data = {"version": PLAN_VERSION, "created": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self.created)),
+                "complete": self.complete, "entries": self.sorted_entries()}
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, sort_keys=True, ensure_ascii=False)
+            f.write("\n")
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != PLAN_VERSION:
+            raise ValueError(f"Unsupported plan version {data.get('version')}.")
+        created = time.mktime(time.strptime(data["created"], "%Y-%m-%d %H:%M:%S"))
+        return cls(data["entries"], created, data.get("complete", False))
+
+
+def diff_plans(old, new):
+    # (added, removed, changed) entries; changed = same video, different current or target values
+    added = [e for vid, e in new.entries.items() if vid not in old.entries]
+    removed = [e for vid, e in old.entries.items() if vid not in new.entries]
+    changed = []
+    for vid, e in new.entries.items():
+        o = old.entries.get(vid)
+        if o and any(o.get(k) != e.get(k) for k in ENTRY_FIELDS if k not in ("page", "position")):
+            changed.append((o, e))
+    return added, removed, changed
+
+
+def latest_plan(plan_dir, exclude=None):
+    if not os.path.isdir(plan_dir): return None
+    names = sorted(n for n in os.listdir(plan_dir) if n.startswith("plan_") and n.endswith(".json"))
+    paths = [os.path.join(plan_dir, n) for n in names]
+    paths = [p for p in paths if not exclude or os.path.abspath(p) != os.path.abspath(exclude)]
+    return paths[-1] if paths else None
+
+
+def describe(e):
+    changes = []
+    if e["target_channel"]: changes.append(f"channel {e['current_channel']!r} -> {e['target_channel']!r}")
+    if e["target_tags"] is not None: changes.append(f"tags {e['current_tags']!r} -> {e['target_tags']!r}")
+    return f"{e['video_id']} (pg {e['page']}) {e['title'][:40]!r}: {', '.join(changes)}"
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Show or compare change plans written by dry runs.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    show = sub.add_parser("show")
+    show.add_argument("plan")
+    diff = sub.add_parser("diff")
+    diff.add_argument("old")
+    diff.add_argument("new")
+    args = ap.parse_args(argv)
+
+    if args.cmd == "show":
+        plan = ChangePlan.load(args.plan)
+        for e in plan.sorted_entries():
+            print(describe(e))
+        print(f"{len(plan)} changes{'' if plan.complete else ' (incomplete run)'}.")
+        return 0
+
+    added, removed, changed = diff_plans(ChangePlan.load(args.old), ChangePlan.load(args.new))
+    for e in added:
+        print("+ " + describe(e))
+    for e in removed:
+        print("- " + describe(e))
+    for o, e in changed:
+        print("~ " + describe(o))
+        print("  " + describe(e))
+    print(f"{len(added)} added, {len(removed)} removed, {len(changed)} changed.")
+    return 1 if added or removed or changed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+# --- DRIVER POOL ---
+# Keeps worker browsers alive between swarm runs. Launches are bounded by a
+# semaphore so several browsers start at once without all of them competing for
+# CPU, and idle drivers are health-checked before being handed out again. An
+# optional limit caps the drivers alive at once (the memory budget): a launch
+# past it waits until a driver is released (and reuses it) or goes away.
+import threading
+
+
+class DriverPool:
+    def __init__(self, factory, launch_concurrency=4, limit=None, on_discard=None):
+        # factory(key) -> ready driver; key identifies launch options (e.g. headless)
+        # limit(key) -> max drivers alive at once, or None
+        self.factory = factory
+        self.limit = limit
+        self.on_discard = on_discard
+        self._launch_gate = threading.Semaphore(max(1, launch_concurrency))
+        self._lock = threading.Condition()
+        self._idle = []
+        self._live = []
+        self._launching = 0
+
+    @staticmethod
+    def is_healthy(driver):
+        try:
+            driver.current_url
+            return True
+        except Exception:
+            return False
+
+    def acquire(self, key, should_continue=lambda: True):
+        # Returns (driver, warm), or (None, False) if should_continue() turned
+        # False while waiting for room. Warm drivers are idle ones with the same
+        # key (from an earlier run or a worker that finished); idle drivers with
+        # another key are closed rather than reused.
+        while True:
+            driver = victim = None
+            with self._lock:
+                driver = self._pop_idle(key)
+                if driver is None and self._idle:
+                    victim = self._idle.pop()[1]
+                elif driver is None:
+                    cap = self.limit(key) if self.limit else None
+                    if cap is None or len(self._live) + self._launching < cap:
+                        self._launching += 1
+                        break
+                    if not should_continue(): return None, False
+                    # Woken by release() or discard()
+                    self._lock.wait(1)
+            if driver is not None:
+                if self.is_healthy(driver): return driver, True
+                self.discard(driver)
+            if victim is not None: self.discard(victim)
+
+        try:
+            with self._launch_gate:
+                driver = self.factory(key)
+        except Exception:
+            with self._lock:
+                self._launching -= 1
+                self._lock.notify_all()
+            raise
+        with self._lock:
+            self._launching -= 1
+            self._live.append(driver)
+        return driver, False
+
+    def _pop_idle(self, key):
+        # Most recently released idle driver with this key; caller holds the lock
+        for i in range(len(self._idle) - 1, -1, -1):
+            if self._idle[i][0] == key: return self._idle.pop(i)[1]
+        return None
+
+    def release(self, driver, key):
+        if self.is_healthy(driver):
+            with self._lock:
+                self._idle.append((key, driver))
+                self._lock.notify_all()
+        else:
+            self.discard(driver)
+
+    def discard(self, driver):
+        with self._lock:
+            if driver in self._live: self._live.remove(driver)
+            self._lock.notify_all()
+        if self.on_discard: self.on_discard(driver)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def live_count(self):
+        with self._lock:
+            return len(self._live)
+
+    def close_all(self):
+        with self._lock:
+            drivers = list(self._live)
+            self._live.clear()
+            self._idle.clear()
+            self._lock.notify_all()
+        for d in drivers:
+            try:
+                d.quit()
+            except Exception:
+                pass
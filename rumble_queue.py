@@ -0,0 +1,50 @@
+# --- VIDEO QUEUE ---
+# Matched videos waiting for an editor, bucketed by listing page. Any free
+# editor can take any pending video; it is handed one from the page it already
+# has open when there is one, otherwise one from the lowest page, so editors
+# share a busy page instead of each reloading pages per video. Scanners close
+# the queue when they are done; editors stop once it is closed and empty.
+import threading
+from collections import deque
+
+
+class VideoQueue:
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._pages = {}
+        self._size = 0
+        self.total = 0  # videos ever queued
+        self.closed = False
+
+    def put(self, page, rows):
+        with self._cond:
+            self._pages.setdefault(page, deque()).extend(rows)
+            self._size += len(rows)
+            self.total += len(rows)
+            self._cond.notify_all()
+
+    def get(self, prefer=None, timeout=1):
+        # A video, or None after timeout / once closed and empty
+        with self._cond:
+            if not self._size and not self.closed:
+                self._cond.wait(timeout)
+            if not self._size: return None
+            page = prefer if self._pages.get(prefer) else min(self._pages)
+            rows = self._pages[page]
+            row = rows.popleft()
+            if not rows: del self._pages[page]
+            self._size -= 1
+            return row
+
+    def close(self):
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+    def qsize(self):
+        with self._cond:
+            return self._size
+
+    def done(self):
+        with self._cond:
+            return self.closed and not self._size
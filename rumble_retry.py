@@ -0,0 +1,139 @@
+# --- RETRY POLICY / CIRCUIT BREAKER ---
+# One retry policy for every worker: failed steps are classified, only the
+# kinds that can succeed on a second try are retried, and retries back off
+# exponentially with full jitter so workers that failed together do not come
+# back together. Every attempt is also reported to a swarm-wide circuit
+# breaker: when the failure rate of the last few seconds spikes, all workers
+# pause for a cool-down and the swarm resumes with fewer editors.
+import random
+import threading
+import time
+from collections import Counter, deque
+
+from rumble_scan import SessionExpiredError
+
+STALE = "stale"  # the page changed under the worker (stale element, click intercepted)
+TIMEOUT = "timeout"  # page, element or request did not answer in time
+SESSION = "session"  # logged out: never retried, the run stops
+SERVER = "server"  # 5xx / 429 / connection refused or reset
+OTHER = "other"
+RETRYABLE = (STALE, TIMEOUT, SERVER)
+
+ATTEMPTS = 3
+BASE_DELAY = 0.5  # seconds, first backoff ceiling
+MAX_DELAY = 8.0
+
+WINDOW = 30  # seconds of attempts the breaker looks at
+MIN_CALLS = 10  # attempts needed in the window before it can trip
+TRIP_RATE = 0.5  # failure rate that opens the breaker
+COOLDOWN = 15  # seconds paused on the first trip, doubled on each trip in a row
+MAX_COOLDOWN = 120
+
+# Classified by class name so this module does not need Selenium or requests
+STALE_ERRORS = {"StaleElementReferenceException", "ElementClickInterceptedException",
+                "ElementNotInteractableException", "NoSuchElementException"}
+TIMEOUT_ERRORS = {"TimeoutException", "Timeout", "ReadTimeout", "ConnectTimeout", "TimeoutError", "timeout"}
+SERVER_ERRORS = {"ConnectionError", "ConnectionResetError", "ConnectionRefusedError", "ChunkedEncodingError"}
+SERVER_MARKERS = ("ERR_CONNECTION", "ERR_EMPTY_RESPONSE", "ERR_HTTP2", "ERR_TIMED_OUT", "ERR_NAME_NOT_RESOLVED",
+                  "ERR_INTERNET_DISCONNECTED", "ERR_NETWORK_CHANGED")
+
+
+def classify(e):
+    if isinstance(e, SessionExpiredError): return SESSION
+    names = {c.__name__ for c in type(e).__mro__}
+    if names & STALE_ERRORS: return STALE
+    if names & TIMEOUT_ERRORS: return TIMEOUT
+    status = getattr(getattr(e, "response", None), "status_code", None)
+    if status is not None:
+        return SERVER if status >= 500 or status == 429 else OTHER
+    if names & SERVER_ERRORS: return SERVER
+    msg = str(e)
+    if "ERR_TIMED_OUT" in msg or "timed out" in msg.lower(): return TIMEOUT
+    if any(m in msg for m in SERVER_MARKERS): return SERVER
+    # Any other driver hiccup: reload and try again
+    if "WebDriverException" in names: return STALE
+    return OTHER
+
+
+def backoff(attempt, base=BASE_DELAY, cap=MAX_DELAY):
+    # Full jitter: anywhere between 0 and the exponential ceiling
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+class RetryPolicy:
+    def __init__(self, breaker=None, attempts=ATTEMPTS, base=BASE_DELAY, cap=MAX_DELAY):
+        self.breaker = breaker
+        self.attempts = max(1, attempts)
+        self.base = base
+        self.cap = cap
+
+    def record(self, ok, kind=None):
+        if self.breaker and kind != SESSION: self.breaker.record(ok, kind)
+
+    def sleep(self, attempt, should_continue=lambda: True):
+        end = time.time() + backoff(attempt, self.base, self.cap)
+        while should_continue() and time.time() < end:
+            time.sleep(min(0.2, max(0, end - time.time())))
+
+    def call(self, fn, should_continue=lambda: True, on_retry=None):
+        # fn() with retries; the last error (or any non-retryable one) is raised
+        for attempt in range(self.attempts):
+            if self.breaker: self.breaker.wait(should_continue)
+            try:
+                result = fn()
+            except Exception as e:
+                kind = classify(e)
+                self.record(False, kind)
+                if kind not in RETRYABLE or attempt == self.attempts - 1 or not should_continue(): raise
+                if on_retry: on_retry(attempt + 1, kind, e)
+                self.sleep(attempt, should_continue)
+                continue
+            self.record(True)
+            return result
+
+
+class CircuitBreaker:
+    def __init__(self, on_trip=None, on_resume=None):
+        self.on_trip = on_trip
+        self.on_resume = on_resume
+        self._lock = threading.Lock()
+        self._calls = deque()  # (time, kind or None)
+        self.open_until = 0
+        self.trips = 0
+        self._streak = 0  # trips in a row without a healthy window in between
+        self._paused = False
+
+    def record(self, ok, kind=None):
+        now = time.time()
+        with self._lock:
+            if now < self.open_until: return
+            self._calls.append((now, None if ok else kind or OTHER))
+            while self._calls and self._calls[0][0] < now - WINDOW:
+                self._calls.popleft()
+            if len(self._calls) < MIN_CALLS: return
+            failures = Counter(k for _, k in self._calls if k)
+            rate = sum(failures.values()) / len(self._calls)
+            if rate < TRIP_RATE:
+                if rate < TRIP_RATE / 2: self._streak = 0
+                return
+            cooldown = min(MAX_COOLDOWN, COOLDOWN * 2 ** self._streak)
+            self._streak += 1
+            self.trips += 1
+            self.open_until = now + cooldown
+            self._paused = True
+            self._calls.clear()
+        if self.on_trip: self.on_trip(rate, dict(failures), cooldown)
+
+    def is_open(self):
+        return time.time() < self.open_until
+
+    def wait(self, should_continue=lambda: True):
+        # Blocks while the breaker is open; False if the run stopped meanwhile
+        while should_continue():
+            remaining = self.open_until - time.time()
+            if remaining <= 0: break
+            time.sleep(min(0.5, remaining))
+        with self._lock:
+            resumed, self._paused = self._paused and not self.is_open(), self._paused and self.is_open()
+        if resumed and self.on_resume: self.on_resume()
+        return should_continue()
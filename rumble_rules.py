@@ -0,0 +1,190 @@
+# --- RULE MATCHING ENGINE ---
+# Rules are compiled once per swarm launch. Title keywords go into a single
+# Aho-Corasick automaton so a title is scanned once no matter how many rules
+# exist, and category keywords are indexed so each distinct category string is
+# only resolved once per run. Both the scan phase (title only, category
+# unknown) and the edit phase (title + category) use the same evaluation:
+# rules are tried in list order and the first satisfied rule wins.
+#
+# Tags are compared as sets: "ps5, Review" and "review,ps5" are the same tags,
+# so a video is only saved when its normalized tags really change. A rule's
+# tag_mode says what its tags do: replace all tags, merge into them, or
+# remove them.
+
+TAG_MODES = ("replace", "merge", "remove")
+
+
+class KeywordAutomaton:
+    def __init__(self, keywords):
+        # State 0 is the root. goto[s] maps a character to the next state,
+        # out[s] lists the keyword ids that end at state s.
+        self.goto = [{}]
+        self.fail = [0]
+        self.out = [[]]
+
+        for kid, kw in enumerate(keywords):
+            state = 0
+            for ch in kw:
+                nxt = self.goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[state][ch] = nxt
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.out.append([])
+                state = nxt
+            self.out[state].append(kid)
+
+        # Breadth-first pass to build failure links
+        frontier = list(self.goto[0].values())
+        while frontier:
+            next_frontier = []
+            for state in frontier:
+                for ch, nxt in self.goto[state].items():
+                    f = self.fail[state]
+                    while f and ch not in self.goto[f]:
+                        f = self.fail[f]
+                    cand = self.goto[f].get(ch, 0)
+                    self.fail[nxt] = cand if cand != nxt else 0
+                    self.out[nxt] = self.out[nxt] + self.out[self.fail[nxt]]
+                    next_frontier.append(nxt)
+            frontier = next_frontier
+
+    def find(self, text):
+        found = set()
+        goto, fail, out = self.goto, self.fail, self.out
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                found.update(out[state])
+        return found
+
+
+class RuleMatcher:
+    def __init__(self, rules):
+        self.rules = list(rules)
+        self._title_kws = []
+        self._cat_kws = []
+
+        keyword_ids = {}
+        self._kw_rules = []      # keyword id -> rule indices using it (ascending)
+        self._cat_only = []      # rule indices with a category but no title keyword
+
+        for idx, r in enumerate(self.rules):
+            t_kw = r.get('title', '').strip().lower()
+            c_kw = r.get('cat', '').strip().lower()
+            self._title_kws.append(t_kw)
+            self._cat_kws.append(c_kw)
+
+            if t_kw:
+                kid = keyword_ids.get(t_kw)
+                if kid is None:
+                    kid = len(self._kw_rules)
+                    keyword_ids[t_kw] = kid
+                    self._kw_rules.append([])
+                self._kw_rules[kid].append(idx)
+            elif c_kw:
+                self._cat_only.append(idx)
+
+        self._automaton = KeywordAutomaton(list(keyword_ids))
+        self._distinct_cats = sorted({c for c in self._cat_kws if c})
+        self._cat_cache = {}
+
+    def __len__(self):
+        return len(self.rules)
+
+    def _matching_cats(self, category):
+        # Set of category keywords contained in this category (memoized per string)
+        key = category.strip().lower()
+        hit = self._cat_cache.get(key)
+        if hit is None:
+            hit = frozenset(c for c in self._distinct_cats if c in key)
+            self._cat_cache[key] = hit
+        return hit
+
+    def match_index(self, title, category=None):
+        # category=None means "not known yet" (scan phase): any category
+        # condition is treated as satisfiable so the video is kept as a candidate.
+        cats = None if category is None else self._matching_cats(category)
+
+        def cat_ok(idx):
+            c_kw = self._cat_kws[idx]
+            return not c_kw or cats is None or c_kw in cats
+
+        best = None
+        for kid in self._automaton.find((title or "").lower()):
+            for idx in self._kw_rules[kid]:
+                if best is not None and idx >= best:
+                    break
+                if cat_ok(idx):
+                    best = idx
+                    break
+
+        for idx in self._cat_only:
+            if best is not None and idx >= best:
+                break
+            if cat_ok(idx):
+                best = idx
+                break
+
+        return best
+
+    def match(self, title, category=None):
+        idx = self.match_index(title, category)
+        return None if idx is None else self.rules[idx]
+
+
+def split_tags(value):
+    # Tags in order, whitespace collapsed, duplicates (ignoring case) dropped
+    tags, seen = [], set()
+    for t in (value or "").split(","):
+        t = " ".join(t.split())
+        if t and t.lower() not in seen:
+            seen.add(t.lower())
+            tags.append(t)
+    return tags
+
+
+def reconcile_tags(mode, target, current):
+    # The tag string to save ("" clears every tag), or None when the normalized tags would not change
+    target_tags, current_tags = split_tags(target), split_tags(current)
+    current_keys = {t.lower() for t in current_tags}
+    if mode == "merge":
+        result = current_tags + [t for t in target_tags if t.lower() not in current_keys]
+    elif mode == "remove":
+        drop = {t.lower() for t in target_tags}
+        result = [t for t in current_tags if t.lower() not in drop]
+    else:
+        result = target_tags
+    if {t.lower() for t in result} == current_keys: return None
+    return ", ".join(result)
+
+
+def tag_save_avoided(rule, current_tags):
+    # True when the raw tag strings differ but the normalized tags already match,
+    # i.e. a save the plain string comparison would have made for nothing
+    target = rule.get('tags', '').strip()
+    if not target or target == (current_tags or "").strip(): return False
+    return reconcile_tags(rule.get('tag_mode', "replace"), target, current_tags) is None
+
+
+def plan_changes(rule, current_chan, current_tags):
+    # Returns (new_channel, new_tags); None means that field is already correct.
+    target_chan_name = rule['target'].strip()
+    target_tags_val = rule.get('tags', '').strip()
+
+    new_chan = None
+    new_tags = None
+
+    # Check Channel (Case Insensitive Fuzzy)
+    if target_chan_name and target_chan_name.lower() not in (current_chan or "").strip().lower():
+        new_chan = target_chan_name
+
+    # Check Tags (as sets, per the rule's tag mode)
+    if target_tags_val:
+        new_tags = reconcile_tags(rule.get('tag_mode', "replace"), target_tags_val, current_tags)
+
+    return new_chan, new_tags
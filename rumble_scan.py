@@ -0,0 +1,311 @@
+# --- LISTING SCAN ---
+# Parsing of the /account/content listing plus a browserless scan backend that
+# reuses the saved login cookies in a pooled requests.Session. Browsers are then
+# only needed for the videos that actually matched a rule.
+import os
+import pickle
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup
+
+# Overridable so the app can be pointed at the local stand-in (benchmarks/standin_server.py)
+RUMBLE_BASE = os.environ.get("RUMBLE_BASE_URL", "https://rumble.com").rstrip("/")
+LISTING_URL = RUMBLE_BASE + "/account/content?&pg={page}"
+
+
+VIDEO_ID_ATTRS = ("data-video-id", "data-video", "data-id")
+VIDEO_HREF_RE = re.compile(r"/(v[0-9a-z]+)[-.]")
+PAGE_HREF_RE = re.compile(r"[?&]pg=(\d+)")
+MAX_PAGES = 2000  # upper bound for page discovery probes
+LOGIN_COOKIE = "u_s"  # Rumble's login cookie; its expiry is the session's
+
+# Row titles are normalized the same way in the page and in parse_listing():
+# text nodes joined by a space, whitespace runs collapsed (see clean_text).
+ROW_TEXT_JS = """
+function rowText(el) {
+    var parts = [], walker = document.createTreeWalker(el, NodeFilter.SHOW_TEXT, null), n;
+    while ((n = walker.nextNode())) parts.push(n.nodeValue);
+    return parts.join(' ').replace(/\\s+/g, ' ').trim();
+}
+"""
+
+# Locates a row's .open-menu trigger by video id, falling back to its position
+# only when the title there still matches. Returns null if the row is gone.
+FIND_TRIGGER_JS = ROW_TEXT_JS + """
+var vid = arguments[0], pos = arguments[1], title = arguments[2];
+var navs = document.querySelectorAll('.my-videos-nav');
+function container(nav) { return nav.closest('article') || nav.closest('div.media-by-user') || nav; }
+if (vid) {
+    var attrs = ['data-video-id', 'data-video', 'data-id'];
+    for (var i = 0; i < navs.length; i++) {
+        var box = container(navs[i]);
+        for (var a = 0; a < attrs.length; a++) {
+            if (box.querySelector('[' + attrs[a] + '="' + vid + '"]') || box.getAttribute(attrs[a]) === vid)
+                return navs[i].querySelector('.open-menu');
+        }
+        if (box.querySelector('a[href*="/' + vid + '-"], a[href*="/' + vid + '."]'))
+            return navs[i].querySelector('.open-menu');
+    }
+}
+if (pos < navs.length) {
+    var el = container(navs[pos]).querySelector('.video-title');
+    if (!el || rowText(el) === title) return navs[pos].querySelector('.open-menu');
+}
+return null;
+"""
+
+# Same rows as parse_listing(), built in the page so only compact JSON crosses
+# the driver instead of the whole DOM.
+EXTRACT_ROWS_JS = ROW_TEXT_JS + """
+var navs = document.querySelectorAll('.my-videos-nav');
+var attrs = ['data-video-id', 'data-video', 'data-id'], hrefRe = /\\/(v[0-9a-z]+)[-.]/;
+function videoId(box) {
+    for (var a = 0; a < attrs.length; a++) {
+        if (box.getAttribute(attrs[a])) return box.getAttribute(attrs[a]);
+        var el = box.querySelector('[' + attrs[a] + ']');
+        if (el && el.getAttribute(attrs[a])) return el.getAttribute(attrs[a]);
+    }
+    var links = box.querySelectorAll('a[href]');
+    for (var i = 0; i < links.length; i++) {
+        var m = hrefRe.exec(links[i].getAttribute('href'));
+        if (m) return m[1];
+    }
+    return null;
+}
+var rows = [];
+for (var i = 0; i < navs.length; i++) {
+    var box = navs[i].closest('article') || navs[i].closest('div.media-by-user');
+    var title = 'Unknown';
+    if (box) {
+        var t = box.querySelector('.video-title');
+        title = rowText(t || box);
+    }
+    rows.push({position: i, title: title, video_id: videoId(box || navs[i])});
+}
+return rows;
+"""
+
+
+class SessionExpiredError(Exception):
+    pass
+
+
+def extract_video_id(container):
+    # Rumble ids look like "v4abc12"; prefer explicit data attributes, then video links
+    for attr in VIDEO_ID_ATTRS:
+        if container.get(attr):
+            return container.get(attr)
+        el = container.select_one(f"[{attr}]")
+        if el and el.get(attr):
+            return el.get(attr)
+    for a in container.select("a[href]"):
+        m = VIDEO_HREF_RE.search(a["href"])
+        if m:
+            return m.group(1)
+    return None
+
+
+def clean_text(el):
+    # Same normalization as rowText() in ROW_TEXT_JS
+    return " ".join(el.get_text(" ").split())
+
+
+def parse_listing(html):
+    # One entry per .my-videos-nav in page order. video_id is the stable
+    # address of the row; position is only used when no id could be found.
+    soup = BeautifulSoup(html, 'html.parser')
+    rows = []
+    for idx, nav in enumerate(soup.select(".my-videos-nav")):
+        article_container = nav.find_parent("article")
+        if not article_container: article_container = nav.find_parent("div", class_="media-by-user")
+
+        if article_container:
+            title_el = article_container.select_one(".video-title")
+            row_text = clean_text(title_el or article_container)
+        else:
+            row_text = "Unknown"
+
+        video_id = extract_video_id(article_container or nav)
+        rows.append({"position": idx, "title": row_text, "video_id": video_id})
+    return rows
+
+
+def extract_rows(driver):
+    # In-page extraction first; the full page_source + BeautifulSoup parse is
+    # only the fallback when the script fails or returns something unexpected.
+    try:
+        rows = driver.execute_script(EXTRACT_ROWS_JS)
+        if isinstance(rows, list):
+            return rows
+    except Exception:
+        pass
+    return parse_listing(driver.page_source)
+
+
+def parse_page_count(html):
+    # Highest page number linked from the pagination markup (0 when there is none).
+    # Paginators often show a window of pages, so callers treat this as a hint.
+    soup = BeautifulSoup(html, 'html.parser')
+    pages = [int(m.group(1)) for a in soup.select("a[href]") for m in [PAGE_HREF_RE.search(a["href"])] if m]
+    return max(pages, default=0)
+
+
+def discover_last_page(has_rows, known_good, limit=MAX_PAGES):
+    # Exponential probe forward from a page known to have videos, then binary
+    # search between the last page with videos and the first empty one.
+    lo, step = known_good, 1
+    while True:
+        cand = lo + step
+        if cand > limit:
+            hi = limit + 1
+            break
+        if has_rows(cand):
+            lo, step = cand, step * 2
+        else:
+            hi = cand
+            break
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if has_rows(mid):
+            lo = mid
+        else:
+            hi = mid
+    return lo
+
+
+def load_session_cookies(session, cookies_file):
+    # Cookies are pickled Selenium dicts (name, value, domain, path, ...)
+    with open(cookies_file, "rb") as f:
+        cookies = pickle.load(f)
+    set_session_cookies(session, cookies)
+    return cookies
+
+
+def cookie_expiry(cookies):
+    # Unix time the login cookie expires, None if unknown or a browser-session cookie
+    for c in cookies:
+        if c.get("name") == LOGIN_COOKIE and c.get("expiry"):
+            return c["expiry"]
+    return None
+
+
+def is_login_url(url):
+    # Logged-out requests for account pages end up on the login page
+    return "login" in (url or "")
+
+
+def set_session_cookies(session, cookies):
+    for c in cookies:
+        try:
+            session.cookies.set(c["name"], c["value"], domain=c.get("domain", ".rumble.com"),
+                                path=c.get("path", "/"))
+        except Exception:
+            pass
+
+
+def make_session(user_agent="", pool_size=1):
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    if user_agent:
+        session.headers["User-Agent"] = user_agent
+    return session
+
+
+class HttpScanner:
+    def __init__(self, cookies_file, user_agent="", concurrency=8, timeout=15, retry=None):
+        self.concurrency = max(1, concurrency)
+        self.timeout = timeout
+        self.retry = retry  # optional shared RetryPolicy (rumble_retry) for listing fetches
+        self._should_continue = lambda: True
+
+        self.session = make_session(user_agent, self.concurrency)
+        self.expires = None
+        if os.path.exists(cookies_file):
+            self.expires = cookie_expiry(load_session_cookies(self.session, cookies_file))
+
+    def check_session(self):
+        # One cheap authenticated request; returns the login's expiry (or None)
+        if self.expires is not None and self.expires < time.time():
+            expired = time.strftime("%Y-%m-%d %H:%M", time.localtime(self.expires))
+            raise SessionExpiredError(f"Saved login expired on {expired}.")
+        resp = self.session.get(RUMBLE_BASE + "/account/content", timeout=self.timeout)
+        if resp.status_code in (401, 403) or is_login_url(resp.url):
+            raise SessionExpiredError(f"Saved login was rejected (HTTP {resp.status_code}).")
+        resp.raise_for_status()
+        return self.expires
+
+    def fetch_listing_html(self, page):
+        resp = self.session.get(LISTING_URL.format(page=page), timeout=self.timeout)
+        if resp.status_code in (401, 403) or is_login_url(resp.url):
+            raise SessionExpiredError(f"Session rejected on page {page} (HTTP {resp.status_code}).")
+        resp.raise_for_status()
+        return resp.text
+
+    def fetch_listing(self, page):
+        return parse_listing(self.fetch_listing_html(page))
+
+    def has_rows(self, page, attempts=2):
+        # A probe that errors is retried; repeated errors propagate instead of
+        # being mistaken for an empty page.
+        for attempt in range(attempts):
+            try:
+                return bool(self.fetch_listing(page))
+            except SessionExpiredError:
+                raise
+            except Exception:
+                if attempt == attempts - 1: raise
+
+    def page_count(self, start_pg):
+        # Last page with videos (start_pg - 1 when the start page itself is empty)
+        html = self.fetch_listing_html(start_pg)
+        if not parse_listing(html):
+            return start_pg - 1
+        known_good = start_pg
+        hinted = parse_page_count(html)
+        if start_pg < hinted <= MAX_PAGES and self.has_rows(hinted):
+            known_good = hinted
+        return discover_last_page(self.has_rows, known_good)
+
+    def _fetch_safe(self, page):
+        try:
+            if self.retry: return self.retry.call(lambda: self.fetch_listing(page), self._should_continue), None
+            return self.fetch_listing(page), None
+        except SessionExpiredError:
+            raise
+        except Exception as e:
+            return None, e
+
+    def scan(self, start_pg, max_pages, on_page, on_error=None, should_continue=lambda: True, stop_on_empty=True):
+        # Pages are fetched in concurrent batches and reported in page order.
+        # The scan ends at the first empty page (unless the page count is already
+        # known) or when on_page returns False; a page that errors is reported
+        # through on_error and skipped. Returns the number of pages with videos.
+        self._should_continue = should_continue
+        scanned = 0
+        page = start_pg
+        end = start_pg + max_pages
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            while page < end and should_continue():
+                batch = list(range(page, min(page + self.concurrency, end)))
+                for pg, (rows, err) in zip(batch, pool.map(self._fetch_safe, batch)):
+                    if err is not None:
+                        if on_error: on_error(pg, err)
+                        continue
+                    if not rows:
+                        if stop_on_empty: return scanned
+                        if on_error: on_error(pg, Exception("page came back empty"))
+                        continue
+                    scanned += 1
+                    if on_page(pg, rows) is False:
+                        return scanned
+                page = batch[-1] + 1
+        return scanned
+
+    def close(self):
+        self.session.close()